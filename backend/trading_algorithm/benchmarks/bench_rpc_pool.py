@@ -0,0 +1,98 @@
+"""Compare one Tatum endpoint against a hedged RpcPool over several.
+
+Starts local Tatum stand-ins with different latency, tail latency and
+error rates, then issues the same sequence of reads (gas price and a
+batched eth_call) through a single AsyncTatumProvider and through an
+RpcPool over all of them, reporting p50/p99/max latency and failures:
+
+    python benchmarks/bench_rpc_pool.py --requests 500
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+from typing import List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('TATUM_API_KEY', 'bench')
+from tatum_standin import TatumStandIn
+from tatum_utils import AsyncTatumProvider
+from tx_templates import function_selector
+from rpc_pool import RpcPool
+from monitoring import RPC_HEDGED_REQUESTS, RPC_HEDGE_WINS
+
+# (latency, jitter, tail rate, tail latency, error rate) per stand-in
+ENDPOINTS = [
+    (0.010, 0.005, 0.05, 0.300, 0.00),
+    (0.015, 0.005, 0.05, 0.300, 0.00),
+    (0.020, 0.010, 0.02, 0.300, 0.20),
+]
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+async def drive(provider, requests: int) -> dict:
+    calls = [('0x' + '00' * 19 + '01', '0x' + function_selector('getLatestPrice()'))]
+    latencies = []
+    failures = 0
+    for i in range(requests):
+        started = time.perf_counter()
+        try:
+            if i % 2:
+                await provider.get_gas_price()
+            else:
+                await provider.batch_call(calls)
+        except Exception:
+            failures += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+    return {
+        'p50_ms': _percentile(latencies, 0.5),
+        'p99_ms': _percentile(latencies, 0.99),
+        'max_ms': max(latencies) * 1000 if latencies else None,
+        'failures': failures,
+    }
+
+def _sample(counter) -> float:
+    return counter._value.get()
+
+async def main(requests: int):
+    servers = [
+        TatumStandIn(price_rate=0, latency=latency, jitter=jitter,
+                     tail_rate=tail_rate, tail_latency=tail_latency,
+                     error_rate=error_rate, seed=i)
+        for i, (latency, jitter, tail_rate, tail_latency, error_rate) in enumerate(ENDPOINTS)
+    ]
+    for server in servers:
+        await server.start()
+    try:
+        # No local rate limit, so only the endpoints shape latency
+        async with AsyncTatumProvider(requests_per_second=1e6, base_url=servers[0].base_url) as single:
+            single_result = await drive(single, requests)
+        async with RpcPool([server.base_url for server in servers], requests_per_second=1e6) as pool:
+            pool_result = await drive(pool, requests)
+            endpoints = [
+                (endpoint.name, endpoint.latency, endpoint.error_rate, endpoint.healthy)
+                for endpoint in pool.endpoints
+            ]
+    finally:
+        for server in servers:
+            await server.stop()
+
+    print(f"{'':<18} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'failures':>9}")
+    for name, result in (('single endpoint', single_result), ('hedged pool', pool_result)):
+        print(f"{name:<18} {result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f} "
+              f"{result['max_ms']:>8.1f} {result['failures']:>9}")
+    print(f"\nhedged {_sample(RPC_HEDGED_REQUESTS):.0f} reads, hedge won {_sample(RPC_HEDGE_WINS):.0f}")
+    for name, latency, error_rate, healthy in endpoints:
+        print(f"  {name}: latency EWMA {latency * 1000 if latency else 0:.1f}ms, "
+              f"error EWMA {error_rate:.2f}, {'healthy' if healthy else 'cooling down'}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=500)
+    asyncio.run(main(parser.parse_args().requests))
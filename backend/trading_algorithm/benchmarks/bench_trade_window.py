@@ -0,0 +1,71 @@
+"""Scaling of TradeOptimizer.find_optimal_trade_window against history length.
+
+Compares the vectorized search with the previous per-candidate Python loop
+on synthetic gas histories that all fall within the last hour, after
+checking that both pick the same window.
+
+    python benchmarks/bench_trade_window.py [--sizes 1000 10000 100000] [--repeat 5]
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+from decimal import Decimal
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# The legacy loop lives with the tests that check parity against it
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tests'))
+from trade_optimizer import TradeOptimizer
+from trade_window_reference import build_optimizer, legacy_find_window, same_window
+
+def check_parity(optimizer: TradeOptimizer, size: Decimal, time_range: timedelta,
+                 now: datetime, loop: asyncio.AbstractEventLoop):
+    """Raise AssertionError if the vectorized search disagrees with the legacy loop"""
+    vectorized = loop.run_until_complete(
+        optimizer.find_optimal_trade_window(size, time_range, now=now)
+    )
+    legacy = legacy_find_window(optimizer, size, time_range, now=now)
+    if not same_window(vectorized, legacy):
+        raise AssertionError(f"Vectorized window {vectorized} does not match legacy {legacy}")
+
+def time_call(fn, repeat: int) -> float:
+    """Best-of-repeat wall time of fn() in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    size = Decimal('5000')
+    # A full day, so every minimum in the last hour is a candidate
+    time_range = timedelta(days=1)
+    loop = asyncio.new_event_loop()
+    print(f"{'history':>10} {'vectorized ms':>14} {'legacy ms':>10} {'speedup':>8}")
+    for history in args.sizes:
+        now = datetime.now()
+        optimizer = build_optimizer(history, now=now)
+        check_parity(optimizer, size, time_range, now, loop)
+        vectorized = time_call(
+            lambda: loop.run_until_complete(
+                optimizer.find_optimal_trade_window(size, time_range)
+            ),
+            args.repeat
+        )
+        legacy = time_call(
+            lambda: legacy_find_window(optimizer, size, time_range),
+            args.repeat
+        )
+        print(f"{history:>10} {vectorized:>14.2f} {legacy:>10.2f} {legacy / vectorized:>7.1f}x")
+    loop.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+"""End-to-end load test of one TradingAlgorithm against a local Tatum stand-in.
+
+Starts tatum_standin.TatumStandIn in a separate process, points a
+TradingAlgorithm at it through TATUM_BASE_URL and TATUM_WS_URL, and runs
+the bot's own run_async loop. The PRICE_UPDATE rate is stepped through the
+requested stages. For each stage it reports how many ticks were sent and
+handled, and p50/p99 latency from the server sending a tick to:
+
+- decision: the bot deciding whether to trade on it (handle_price_update
+  returning without a trade, or execute_trade_async starting)
+- broadcast: the resulting transaction being accepted by the broadcast
+  endpoint
+
+    python benchmarks/load_test.py --rates 10 100 500 1000 --duration 30 \\
+        --latency-ms 30 --jitter-ms 20 --error-rate 0.01
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import contextvars
+import multiprocessing
+from datetime import timedelta
+from typing import List, Optional
+import aiohttp
+import structlog
+from eth_account import Account
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import tatum_standin
+
+# Send time of the tick being handled, shared with the tasks it spawns
+_tick = contextvars.ContextVar('tick', default=None)
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    """Percentile in milliseconds, None without samples"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+class LatencyRecorder:
+    """Collects tick-to-decision and tick-to-broadcast latencies"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.handled = 0
+        self.decisions: List[float] = []
+        self.broadcasts: List[float] = []
+
+    def decided(self, tick: Optional[dict]):
+        if tick is not None and not tick['decided']:
+            tick['decided'] = True
+            self.decisions.append(time.time() - tick['sent_at'])
+
+    def summary(self) -> dict:
+        return {
+            'handled': self.handled,
+            'decision_p50_ms': _percentile(self.decisions, 0.5),
+            'decision_p99_ms': _percentile(self.decisions, 0.99),
+            'broadcasts': len(self.broadcasts),
+            'broadcast_p50_ms': _percentile(self.broadcasts, 0.5),
+            'broadcast_p99_ms': _percentile(self.broadcasts, 0.99),
+        }
+
+def instrument(algorithm, recorder: LatencyRecorder):
+    """Wrap the pipeline entry, trade and broadcast calls to timestamp each tick"""
+    handle_price_update = algorithm.handle_price_update
+    execute_trade_async = algorithm.execute_trade_async
+    broadcast = algorithm.tatum_async.broadcast_signed_transaction
+
+    async def timed_handle_price_update(data: dict):
+        tick = {'sent_at': data['sentAt'], 'decided': False} if 'sentAt' in data else None
+        _tick.set(tick)
+        recorder.handled += 1
+        try:
+            await handle_price_update(data)
+        finally:
+            recorder.decided(tick)
+
+    async def timed_execute_trade_async(*args, **kwargs):
+        recorder.decided(_tick.get())
+        return await execute_trade_async(*args, **kwargs)
+
+    async def timed_broadcast(signed_tx: str) -> str:
+        tx_hash = await broadcast(signed_tx)
+        tick = _tick.get()
+        if tick is not None:
+            recorder.broadcasts.append(time.time() - tick['sent_at'])
+        return tx_hash
+
+    algorithm.handle_price_update = timed_handle_price_update
+    algorithm.execute_trade_async = timed_execute_trade_async
+    algorithm.tatum_async.broadcast_signed_transaction = timed_broadcast
+
+def _run_server(args: argparse.Namespace, ready: multiprocessing.Queue):
+    async def serve():
+        server = tatum_standin.from_arguments(args, price_rate=0)
+        await server.start()
+        ready.put((server.base_url, server.ws_url))
+        await asyncio.Event().wait()
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+async def run_load(args: argparse.Namespace, base_url: str, ws_url: str) -> List[dict]:
+    os.environ['TATUM_BASE_URL'] = base_url
+    os.environ['TATUM_WS_URL'] = ws_url
+    os.environ.setdefault('TATUM_API_KEY', 'load-test')
+
+    # Imported late, once the stand-in endpoints are in the environment
+    from monitoring import MonitoringService
+    from tatum_utils import AsyncTatumProvider
+    from trading_algorithm import TradingAlgorithm
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+        structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    algorithm = TradingAlgorithm(
+        tatum_async=AsyncTatumProvider(requests_per_second=args.requests_per_second),
+        monitoring=MonitoringService(metrics_port=None),
+        contract_abi=[],
+        private_key=Account.create().key.hex(),
+        master_control_address='0x' + '00' * 19 + '01'
+    )
+    algorithm.min_trade_interval = timedelta(seconds=args.min_trade_interval)
+    recorder = LatencyRecorder()
+    instrument(algorithm, recorder)
+
+    control_url = base_url.rsplit('/v3', 1)[0]
+    results = []
+    bot = asyncio.create_task(algorithm.run_async())
+    async with aiohttp.ClientSession() as session:
+        async def control(**settings) -> dict:
+            async with session.post(f"{control_url}/_control", json=settings) as response:
+                return await response.json()
+
+        try:
+            for rate in args.rates:
+                await control(price_rate=rate)
+                await asyncio.sleep(args.warmup)
+                before = await control()
+                recorder.reset()
+                await asyncio.sleep(args.duration)
+                after = await control()
+                if bot.done():
+                    bot.result()
+                sent = after['price_updates_sent'] - before['price_updates_sent']
+                results.append({
+                    'rate': rate,
+                    'duration': args.duration,
+                    'sent': sent,
+                    'errors_injected': after['errors_injected'] - before['errors_injected'],
+                    **recorder.summary()
+                })
+        finally:
+            await control(price_rate=0)
+            bot.cancel()
+            await asyncio.gather(bot, return_exceptions=True)
+    return results
+
+def _ms(value: Optional[float]) -> str:
+    return '-' if value is None else f"{value:.1f}"
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test TradingAlgorithm against a local Tatum stand-in')
+    tatum_standin.add_arguments(parser)
+    parser.add_argument('--rates', type=float, nargs='+', default=[10, 100, 500, 1000],
+                        help='PRICE_UPDATE events per second, one stage each')
+    parser.add_argument('--duration', type=float, default=30.0, help='seconds measured per stage')
+    parser.add_argument('--warmup', type=float, default=2.0, help='seconds before measuring a stage')
+    parser.add_argument('--min-trade-interval', type=float, default=10.0,
+                        help='seconds between trades, shortened so trades happen within a stage')
+    parser.add_argument('--requests-per-second', type=float, default=5.0,
+                        help='AsyncTatumProvider per-endpoint rate limit')
+    parser.add_argument('--output', help='write the stage results as JSON')
+    parser.add_argument('--verbose', action='store_true', help='keep the bot logging')
+    args = parser.parse_args()
+
+    ready = multiprocessing.Queue()
+    server = multiprocessing.Process(target=_run_server, args=(args, ready), daemon=True)
+    server.start()
+    try:
+        base_url, ws_url = ready.get(timeout=10)
+        results = asyncio.run(run_load(args, base_url, ws_url))
+    finally:
+        server.terminate()
+        server.join()
+
+    print(f"{'rate/s':>8} {'sent':>7} {'handled':>8} {'decision p50/p99 ms':>21} "
+          f"{'trades':>7} {'broadcast p50/p99 ms':>22} {'errors':>7}")
+    for stage in results:
+        print(f"{stage['rate']:>8.0f} {stage['sent']:>7} {stage['handled']:>8} "
+              f"{_ms(stage['decision_p50_ms']):>10} / {_ms(stage['decision_p99_ms']):<8} "
+              f"{stage['broadcasts']:>7} "
+              f"{_ms(stage['broadcast_p50_ms']):>10} / {_ms(stage['broadcast_p99_ms']):<9} "
+              f"{stage['errors_injected']:>7}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
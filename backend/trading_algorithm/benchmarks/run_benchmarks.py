@@ -0,0 +1,277 @@
+"""Hot-path microbenchmarks for the trading backend.
+
+Measures per-call latency (mean, p50, p99) and allocations (peak transient
+bytes and net memory blocks per call) for the per-tick code paths, and
+writes them as JSON so that results from two versions can be compared:
+
+    python benchmarks/run_benchmarks.py --output after.json
+    python benchmarks/run_benchmarks.py --output after.json --compare before.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import logging
+import platform
+import argparse
+import subprocess
+import tracemalloc
+from decimal import Decimal
+from datetime import datetime
+from typing import Awaitable, Callable, List, Optional, Union
+import orjson
+import structlog
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from clock import SimulatedClock
+from circuit_breaker import CircuitBreaker
+from trade_optimizer import TradeOptimizer
+from event_dispatcher import EventDispatcher, LATEST
+from replay import ReplayEngine, Tick
+
+Call = Callable[[], Union[None, Awaitable[None]]]
+
+def _summarize(name: str, params: dict, timings: List[int],
+               peak_bytes: List[int], net_blocks: int) -> dict:
+    timings = sorted(timings)
+    n = len(timings)
+    return {
+        'name': name,
+        'params': params,
+        'iterations': n,
+        'mean_us': sum(timings) / n / 1000,
+        'p50_us': timings[n // 2] / 1000,
+        'p99_us': timings[min(n - 1, int(n * 0.99))] / 1000,
+        'peak_alloc_bytes': sum(peak_bytes) / len(peak_bytes),
+        'net_blocks_per_call': net_blocks / n,
+    }
+
+async def measure(name: str, call: Call, iterations: int, params: Optional[dict] = None) -> dict:
+    """Time each call after one untimed warm-up, then rerun under tracemalloc to measure its allocations"""
+    is_async = asyncio.iscoroutinefunction(call)
+    # Lazy imports, first-use caches and the like land here, not in p99
+    if is_async:
+        await call()
+    else:
+        call()
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter_ns()
+        if is_async:
+            await call()
+        else:
+            call()
+        timings.append(time.perf_counter_ns() - start)
+
+    peak_bytes = []
+    alloc_iterations = max(1, iterations // 10)
+    tracemalloc.start()
+    blocks_before = sys.getallocatedblocks()
+    for _ in range(alloc_iterations):
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        if is_async:
+            await call()
+        else:
+            call()
+        peak_bytes.append(tracemalloc.get_traced_memory()[1] - baseline)
+    net_blocks = (sys.getallocatedblocks() - blocks_before) * iterations / alloc_iterations
+    tracemalloc.stop()
+    return _summarize(name, params or {}, timings, peak_bytes, net_blocks)
+
+def bench_should_break_circuit(history: int) -> Call:
+    """CircuitBreaker.should_break_circuit with `history` prices over the last hour"""
+    clock = SimulatedClock(1_700_000_000.0)
+    breaker = CircuitBreaker(clock=clock)
+    rng = random.Random(history)
+    step = 3600 / history
+    for _ in range(history):
+        clock.advance(step)
+        breaker.add_price_data(Decimal('1') + Decimal(rng.randint(-100, 100)) / Decimal(1e6))
+
+    def call():
+        clock.advance(step)
+        now = clock.now()
+        breaker.add_price_data(Decimal('1.0001'), now)
+        breaker.should_break_circuit(now)
+    return call
+
+def bench_optimize_trade_execution(history: int) -> Call:
+    """TradeOptimizer.optimize_trade_execution with `history` gas samples over the last hour"""
+    clock = SimulatedClock(1_700_000_000.0)
+    optimizer = TradeOptimizer(clock=clock)
+    rng = random.Random(history)
+    step = 3600 / history
+    gas = 50.0
+    for _ in range(history):
+        clock.advance(step)
+        gas = min(150.0, max(20.0, gas + rng.gauss(0, 2)))
+        optimizer.add_gas_price(int(gas))
+    size = Decimal('50000')
+
+    async def call():
+        await optimizer.optimize_trade_execution(size, max_wait=300)
+    return call
+
+def bench_calculate_trade_size(engine: ReplayEngine) -> Call:
+    algorithm = engine.algorithm
+    price = Decimal('0.985')
+    volume = Decimal('1000000')
+
+    def call():
+        algorithm.calculate_trade_size(price, volume)
+    return call
+
+def bench_handle_price_update(engine: ReplayEngine) -> Call:
+    """handle_price_update end to end against the in-memory replay provider"""
+    algorithm = engine.algorithm
+    provider = engine.provider
+    clock = engine.clock
+    rng = random.Random(0)
+    provider.tick = Tick(clock.time(), Decimal('1'), Decimal('50'), Decimal('1000000'))
+
+    async def call():
+        clock.advance(1)
+        # Mostly in-band prices, with the occasional deviation that trades
+        price = Decimal('1') + Decimal(rng.randint(-150, 150)) / Decimal(10000)
+        provider.tick = Tick(clock.time(), price, Decimal('50'), Decimal('1000000'))
+        await algorithm.handle_price_update({
+            'type': 'PRICE_UPDATE',
+            'price': str(int(price * Decimal(1e8)))
+        })
+    return call
+
+def bench_ws_decode_dispatch() -> Call:
+    """Decode and enqueue one raw PRICE_UPDATE message"""
+    dispatcher = EventDispatcher(policies={'PRICE_UPDATE': LATEST})
+
+    async def handler(data: dict):
+        pass
+    dispatcher.subscribe('PRICE_UPDATE', handler)
+    message = orjson.dumps({
+        'type': 'PRICE_UPDATE',
+        'price': '100000000',
+        'timestamp': '2024-01-20T12:00:00Z'
+    })
+
+    def call():
+        dispatcher.dispatch(message)
+    return call
+
+def bench_ws_dispatch_to_handler() -> Call:
+    """Decode, enqueue and deliver one message to its handler through a worker"""
+    dispatcher = EventDispatcher(policies={'PRICE_UPDATE': LATEST})
+    delivered = asyncio.Event()
+
+    async def handler(data: dict):
+        delivered.set()
+    dispatcher.subscribe('PRICE_UPDATE', handler)
+    message = orjson.dumps({'type': 'PRICE_UPDATE', 'price': '100000000'})
+
+    async def call():
+        dispatcher.start()
+        delivered.clear()
+        dispatcher.dispatch(message)
+        await delivered.wait()
+    return call
+
+async def run_suite(iterations: int, history_sizes: List[int]) -> List[dict]:
+    results = []
+    for history in history_sizes:
+        results.append(await measure(
+            'circuit_breaker.should_break_circuit',
+            bench_should_break_circuit(history), iterations, {'history': history}
+        ))
+    for history in history_sizes:
+        results.append(await measure(
+            'trade_optimizer.optimize_trade_execution',
+            bench_optimize_trade_execution(history), max(10, iterations // 10), {'history': history}
+        ))
+
+    start = Tick(1_700_000_000.0, Decimal('1'), Decimal('50'), Decimal('1000000'))
+    engine = ReplayEngine([start])
+    results.append(await measure(
+        'trading_algorithm.calculate_trade_size', bench_calculate_trade_size(engine), iterations
+    ))
+    results.append(await measure(
+        'trading_algorithm.handle_price_update', bench_handle_price_update(engine), iterations
+    ))
+    results.append(await measure(
+        'event_dispatcher.dispatch', bench_ws_decode_dispatch(), iterations
+    ))
+    results.append(await measure(
+        'event_dispatcher.dispatch_to_handler', bench_ws_dispatch_to_handler(), iterations
+    ))
+    return results
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _key(result: dict) -> str:
+    params = ','.join(f"{k}={v}" for k, v in sorted(result['params'].items()))
+    return f"{result['name']}[{params}]" if params else result['name']
+
+def compare(baseline: dict, current: dict, threshold: float) -> bool:
+    """Print p50 changes against a baseline run; True if any regressed past threshold"""
+    before = {_key(r): r for r in baseline['results']}
+    regressed = False
+    print(f"\n{'benchmark':<58} {'before p50 us':>14} {'after p50 us':>13} {'change':>8}")
+    for result in current['results']:
+        key = _key(result)
+        if key not in before:
+            continue
+        old, new = before[key]['p50_us'], result['p50_us']
+        change = (new - old) / old if old else 0.0
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressed = True
+        print(f"{key:<58} {old:>14.2f} {new:>13.2f} {change:>+7.1%}{flag}")
+    return regressed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--history', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', help='baseline results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='relative p50 slowdown reported as a regression')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    results = asyncio.run(run_suite(args.iterations, args.history))
+    report = {
+        'created_at': datetime.now().isoformat(),
+        'git_revision': _git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'benchmark':<58} {'mean us':>9} {'p50 us':>9} {'p99 us':>9} {'peak B':>9}")
+    for result in results:
+        print(f"{_key(result):<58} {result['mean_us']:>9.2f} {result['p50_us']:>9.2f} "
+              f"{result['p99_us']:>9.2f} {result['peak_alloc_bytes']:>9.0f}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(baseline, report, args.threshold):
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
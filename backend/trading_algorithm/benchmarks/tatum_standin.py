@@ -0,0 +1,400 @@
+"""Local stand-in for the Tatum REST and WebSocket APIs.
+
+Serves the endpoints TatumProvider and AsyncTatumProvider call (gas, nonce,
+broadcast, transactions, gas estimate, balances, subscriptions and the
+web3 JSON-RPC endpoint) and pushes PRICE_UPDATE and BLOCK_MINED events to
+WebSocket subscribers. Prices follow a noisy walk around the $1 peg.
+Broadcast transactions wait in a per-nonce mempool and are mined in nonce
+order into the next block, unless their gas price is below
+`min_gas_price_gwei`. A transaction with the same nonce and at least a
+10% higher gas price replaces the pending one, as on a real node.
+
+Every HTTP response can be delayed by a fixed latency plus uniform jitter,
+a fraction of them by an extra tail latency, and a fraction can fail with
+an injected 503. Price messages carry
+a `sentAt` POSIX timestamp so clients can measure end-to-end latency.
+GET /_stats returns counters; POST /_control changes the event rate,
+latency and error rate of a running server, and with
+`{"drop_connections": true}` closes every WebSocket to test reconnects.
+
+    python benchmarks/tatum_standin.py --port 8080 --rate 200 --latency-ms 20
+
+then point the bot at it with TATUM_BASE_URL=http://127.0.0.1:8080/v3 and
+TATUM_WS_URL=ws://127.0.0.1:8080/v3/polygon.
+"""
+import time
+import random
+import asyncio
+import argparse
+from decimal import Decimal
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
+import rlp
+import orjson
+from aiohttp import web, WSMsgType
+from web3 import Web3
+
+# Control and stats routes are exempt from latency and error injection
+_UNTHROTTLED = ('/_stats', '/_control', '/v3/polygon')
+
+def _selector(signature: str) -> str:
+    return bytes(Web3.keccak(text=signature)[:4]).hex()
+
+def _uint256(value: int) -> str:
+    return '0x' + value.to_bytes(32, 'big').hex()
+
+def _decode_transaction(raw: bytes) -> Tuple[int, int]:
+    """Nonce and gas price (max fee for EIP-1559) of a signed transaction"""
+    if raw[0] >= 0xc0:
+        fields = rlp.decode(raw)  # legacy: nonce, gasPrice, ...
+        return int.from_bytes(fields[0], 'big'), int.from_bytes(fields[1], 'big')
+    fields = rlp.decode(raw[1:])
+    if raw[0] == 2:  # chainId, nonce, maxPriorityFee, maxFee, ...
+        return int.from_bytes(fields[1], 'big'), int.from_bytes(fields[3], 'big')
+    return int.from_bytes(fields[1], 'big'), int.from_bytes(fields[2], 'big')
+
+class TatumStandIn:
+    """In-process Tatum API stand-in with latency and error injection"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0,
+                 price_rate: float = 10.0,
+                 block_time: float = 2.0,
+                 latency: float = 0.0,
+                 jitter: float = 0.0,
+                 error_rate: float = 0.0,
+                 tail_rate: float = 0.0,
+                 tail_latency: float = 0.0,
+                 volatility: float = 0.01,
+                 gas_price_gwei: int = 50,
+                 min_gas_price_gwei: float = 0.0,
+                 supply: Decimal = Decimal('1e6'),
+                 balance: Decimal = Decimal('1e6'),
+                 gas_used: int = 60000,
+                 seed: Optional[int] = None):
+        self.host = host
+        self.port = port
+        self.price_rate = price_rate
+        self.block_time = block_time
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.tail_rate = tail_rate
+        self.tail_latency = tail_latency
+        self.volatility = volatility
+        self.gas_price_gwei = gas_price_gwei
+        self.min_gas_price_gwei = min_gas_price_gwei
+        self.supply = supply
+        self.balance = balance
+        self.gas_used = gas_used
+        self.random = random.Random(seed)
+
+        self.price = Decimal('1')
+        self.block_number = 0
+        # Single-sender chain: next nonce to be mined, and pending (hash, gas price) by nonce
+        self.nonce = 0
+        self.mempool: Dict[int, Tuple[str, int]] = {}
+        self.receipts: Dict[str, dict] = {}
+        self.subscriptions: Dict[web.WebSocketResponse, Set[str]] = {}
+        self.stats = {
+            'requests': 0,
+            'errors_injected': 0,
+            'price_updates_sent': 0,
+            'blocks_mined': 0,
+            'broadcasts': 0,
+            'replacements': 0,
+            'abandoned': 0,
+            'ws_connections': 0,
+            'ws_dropped': 0,
+        }
+        self._calls = {
+            _selector('getLatestPrice()'): lambda: int(self.price * Decimal(1e8)),
+            _selector('totalSupply()'): lambda: int(self.supply * Decimal(1e18)),
+            _selector('balanceOf(address)'): lambda: int(self.balance * Decimal(1e18)),
+        }
+        self._runner: Optional[web.AppRunner] = None
+        self._tasks: List[asyncio.Task] = []
+
+        self.app = web.Application(middlewares=[self._inject_faults])
+        self.app.add_routes([
+            web.get('/v3/polygon', self.handle_websocket),
+            web.get('/v3/polygon/gas', self.handle_gas),
+            web.post('/v3/polygon/gas/estimate', self.handle_estimate_gas),
+            web.get('/v3/polygon/nonce/{address}', self.handle_nonce),
+            web.post('/v3/polygon/broadcast', self.handle_broadcast),
+            web.get('/v3/polygon/transaction/{tx_hash}', self.handle_transaction),
+            web.get('/v3/polygon/account/balance/{token}/{address}', self.handle_balance),
+            web.post('/v3/polygon/web3/{api_key}', self.handle_rpc),
+            web.post('/v3/subscription', self.handle_subscription),
+            web.get('/_stats', self.handle_stats),
+            web.post('/_control', self.handle_control),
+        ])
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v3"
+
+    @property
+    def ws_url(self) -> str:
+        return f"ws://{self.host}:{self.port}/v3/polygon"
+
+    async def start(self):
+        """Bind the server and start the price and block feeds"""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        self._tasks = [
+            asyncio.create_task(self._price_feed()),
+            asyncio.create_task(self._block_feed()),
+        ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        for ws in list(self.subscriptions):
+            await ws.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    @web.middleware
+    async def _inject_faults(self, request: web.Request, handler):
+        if request.path in _UNTHROTTLED:
+            return await handler(request)
+        self.stats['requests'] += 1
+        delay = self.latency + self.random.uniform(0, self.jitter)
+        if self.random.random() < self.tail_rate:
+            delay += self.tail_latency
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.random.random() < self.error_rate:
+            self.stats['errors_injected'] += 1
+            return web.Response(status=503, text='injected error')
+        try:
+            return await handler(request)
+        except ConnectionResetError:
+            # The client gave up, e.g. a hedged read answered elsewhere first
+            self.stats['abandoned'] += 1
+            return web.Response(status=499, text='client closed request')
+
+    def _publish(self, event_type: str, message: dict):
+        payload = orjson.dumps(message).decode()
+        for ws, events in list(self.subscriptions.items()):
+            if event_type in events and not ws.closed:
+                # send_str only queues on the transport, no need to await each socket
+                asyncio.ensure_future(ws.send_str(payload))
+
+    async def _price_feed(self):
+        """Push PRICE_UPDATE events at price_rate per second"""
+        next_at = time.monotonic()
+        while True:
+            if self.price_rate <= 0:
+                await asyncio.sleep(0.1)
+                next_at = time.monotonic()
+                continue
+            next_at += 1.0 / self.price_rate
+            delay = next_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            # Noise around the peg, so some ticks deviate enough to trade
+            self.price = Decimal(1 + self.random.gauss(0, self.volatility)).quantize(Decimal('1e-8'))
+            now = time.time()
+            self._publish('PRICE_UPDATE', {
+                'type': 'PRICE_UPDATE',
+                'price': str(int(self.price * Decimal(1e8))),
+                'timestamp': datetime.fromtimestamp(now, timezone.utc).isoformat(),
+                'sentAt': now
+            })
+            self.stats['price_updates_sent'] += 1
+
+    async def _block_feed(self):
+        """Mine the mempool into a new block every block_time seconds"""
+        while True:
+            await asyncio.sleep(self.block_time)
+            self.block_number += 1
+            min_gas_price = Web3.to_wei(self.min_gas_price_gwei, 'gwei')
+            index = 0
+            while self.nonce in self.mempool and self.mempool[self.nonce][1] >= min_gas_price:
+                tx_hash, gas_price = self.mempool.pop(self.nonce)
+                self.receipts[tx_hash] = {
+                    'transactionHash': tx_hash,
+                    'blockNumber': self.block_number,
+                    'transactionIndex': index,
+                    'gasUsed': self.gas_used,
+                    'cumulativeGasUsed': self.gas_used * (index + 1),
+                    'effectiveGasPrice': gas_price,
+                    'status': 1
+                }
+                self.nonce += 1
+                index += 1
+            self.stats['blocks_mined'] += 1
+            self._publish('BLOCK_MINED', {
+                'type': 'BLOCK_MINED',
+                'blockNumber': str(self.block_number),
+                'timestamp': datetime.now(timezone.utc).isoformat()
+            })
+
+    async def handle_websocket(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.subscriptions[ws] = set()
+        self.stats['ws_connections'] += 1
+        try:
+            async for message in ws:
+                if message.type != WSMsgType.TEXT:
+                    continue
+                data = orjson.loads(message.data)
+                if data.get('type') == 'SUBSCRIBE':
+                    self.subscriptions[ws].add(data.get('event'))
+        finally:
+            self.subscriptions.pop(ws, None)
+        return ws
+
+    async def handle_gas(self, request: web.Request) -> web.Response:
+        return web.json_response({'gasPrice': str(Web3.to_wei(self.gas_price_gwei, 'gwei'))})
+
+    async def handle_estimate_gas(self, request: web.Request) -> web.Response:
+        return web.json_response({'gasLimit': str(self.gas_used)})
+
+    def _pending_nonce(self) -> int:
+        """Next nonce counting transactions still in the mempool"""
+        return max([self.nonce, *(n + 1 for n in self.mempool)])
+
+    async def handle_nonce(self, request: web.Request) -> web.Response:
+        return web.json_response({'nonce': self._pending_nonce()})
+
+    async def handle_broadcast(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        raw = Web3.to_bytes(hexstr=data['txData'])
+        tx_hash = Web3.keccak(raw).hex()
+        nonce, gas_price = _decode_transaction(raw)
+        if tx_hash in self.receipts or self.mempool.get(nonce, (None,))[0] == tx_hash:
+            return web.Response(status=400, text='already known')
+        if nonce < self.nonce:
+            return web.Response(status=400, text='nonce too low')
+        if nonce in self.mempool:
+            if gas_price < self.mempool[nonce][1] * 1.1:
+                return web.Response(status=400, text='replacement transaction underpriced')
+            self.stats['replacements'] += 1
+        self.mempool[nonce] = (tx_hash, gas_price)
+        self.stats['broadcasts'] += 1
+        return web.json_response({'txId': tx_hash})
+
+    async def handle_transaction(self, request: web.Request) -> web.Response:
+        receipt = self.receipts.get(request.match_info['tx_hash'])
+        if receipt is None:
+            return web.Response(status=404, text='transaction not found')
+        return web.json_response(receipt)
+
+    async def handle_balance(self, request: web.Request) -> web.Response:
+        return web.json_response({'balance': str(int(self.balance * Decimal(1e18)))})
+
+    async def handle_subscription(self, request: web.Request) -> web.Response:
+        return web.json_response({'id': f"standin-{self.random.getrandbits(32):08x}"})
+
+    def _rpc(self, call: dict) -> dict:
+        method, params = call.get('method'), call.get('params', [])
+        response = {'jsonrpc': '2.0', 'id': call.get('id')}
+        if method == 'eth_call':
+            data = params[0].get('data', '0x')
+            function = self._calls.get(data[2:10])
+            if function is None:
+                response['error'] = {'code': -32000, 'message': 'execution reverted'}
+            else:
+                response['result'] = _uint256(function())
+        elif method == 'eth_getTransactionReceipt':
+            receipt = self.receipts.get(params[0])
+            if receipt is not None:
+                receipt = {
+                    key: hex(value) if isinstance(value, int) else value
+                    for key, value in receipt.items()
+                }
+            response['result'] = receipt
+        elif method == 'eth_getTransactionCount':
+            response['result'] = hex(self._pending_nonce() if params[1:] == ['pending'] else self.nonce)
+        elif method == 'eth_blockNumber':
+            response['result'] = hex(self.block_number)
+        elif method == 'eth_gasPrice':
+            response['result'] = hex(Web3.to_wei(self.gas_price_gwei, 'gwei'))
+        elif method == 'eth_chainId':
+            response['result'] = hex(137)
+        else:
+            response['error'] = {'code': -32601, 'message': f"method {method} not supported"}
+        return response
+
+    async def handle_rpc(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        if isinstance(payload, list):
+            return web.json_response([self._rpc(call) for call in payload])
+        return web.json_response(self._rpc(payload))
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response({**self.stats, 'block_number': self.block_number})
+
+    async def handle_control(self, request: web.Request) -> web.Response:
+        settings = await request.json()
+        for name in ('price_rate', 'block_time', 'latency', 'jitter', 'error_rate', 'volatility',
+                     'min_gas_price_gwei', 'tail_rate', 'tail_latency'):
+            if name in settings:
+                setattr(self, name, float(settings[name]))
+        if settings.get('drop_connections'):
+            dropped = list(self.subscriptions)
+            self.stats['ws_dropped'] += len(dropped)
+            await asyncio.gather(*(ws.close(code=1012, message=b'dropped') for ws in dropped))
+        return await self.handle_stats(request)
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """Stand-in server options, shared with the load generator"""
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=0, help='0 picks a free port')
+    parser.add_argument('--block-time', type=float, default=2.0, help='seconds between blocks')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='added to every HTTP response')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='uniform extra latency')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='fraction of HTTP requests answered with 503')
+    parser.add_argument('--tail-rate', type=float, default=0.0,
+                        help='fraction of HTTP responses delayed by --tail-ms more')
+    parser.add_argument('--tail-ms', type=float, default=0.0)
+    parser.add_argument('--volatility', type=float, default=0.01,
+                        help='standard deviation of prices around $1')
+    parser.add_argument('--min-gas-price', type=float, default=0.0,
+                        help='Gwei; cheaper transactions stay pending until replaced')
+    parser.add_argument('--seed', type=int)
+
+def from_arguments(args: argparse.Namespace, price_rate: float) -> TatumStandIn:
+    return TatumStandIn(
+        host=args.host,
+        port=args.port,
+        price_rate=price_rate,
+        block_time=args.block_time,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        tail_rate=args.tail_rate,
+        tail_latency=args.tail_ms / 1000,
+        volatility=args.volatility,
+        min_gas_price_gwei=args.min_gas_price,
+        seed=args.seed
+    )
+
+async def serve(server: TatumStandIn):
+    """Run a stand-in until cancelled"""
+    await server.start()
+    print(f"Tatum stand-in on {server.base_url} and {server.ws_url}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description='Local Tatum API stand-in')
+    add_arguments(parser)
+    parser.add_argument('--rate', type=float, default=10.0, help='PRICE_UPDATE events per second')
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(from_arguments(args, args.rate)))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
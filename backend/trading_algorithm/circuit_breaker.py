@@ -1,8 +1,11 @@
+import math
 from decimal import Decimal
-from typing import Optional, List
+from typing import Optional
 from datetime import datetime, timedelta
 import numpy as np
 from dataclasses import dataclass
+from timeseries import TimeSeriesBuffer, RollingWindow
+from clock import Clock
 
 @dataclass
 class VolatilityMetrics:
@@ -12,10 +15,21 @@ class VolatilityMetrics:
     trade_frequency: float
 
 class CircuitBreaker:
-    def __init__(self):
-        self.price_history: List[tuple[datetime, Decimal]] = []
-        self.volume_history: List[tuple[datetime, Decimal]] = []
-        self.trade_history: List[datetime] = []
+    def __init__(self, verify_metrics: bool = False, clock: Optional[Clock] = None):
+        self.clock = clock or Clock()
+        
+        # Histories hold POSIX timestamps with float values, oldest first
+        self.price_history = TimeSeriesBuffer()
+        self.volume_history = TimeSeriesBuffer()
+        self.trade_history = TimeSeriesBuffer(with_values=False)
+        
+        # Streaming statistics over the 5 minute metrics window
+        self.recent_window = timedelta(minutes=5)
+        self._recent_prices = RollingWindow(self.price_history, self.recent_window.total_seconds())
+        self._recent_trades = RollingWindow(self.trade_history, self.recent_window.total_seconds())
+        
+        # Cross-check streaming metrics against the full numpy computation
+        self.verify_metrics = verify_metrics
         self.last_break_time: Optional[datetime] = None
         self.is_active = False
         
@@ -29,120 +43,138 @@ class CircuitBreaker:
     def add_price_data(self, price: Decimal, timestamp: Optional[datetime] = None):
         """Add price data point"""
         if timestamp is None:
-            timestamp = datetime.now()
-        self.price_history.append((timestamp, price))
-        self._cleanup_old_data()
+            timestamp = self.clock.now()
+        self.price_history.append(timestamp.timestamp(), float(price))
+        self._cleanup_old_data(timestamp)
         
     def add_volume_data(self, volume: Decimal, timestamp: Optional[datetime] = None):
         """Add volume data point"""
         if timestamp is None:
-            timestamp = datetime.now()
-        self.volume_history.append((timestamp, volume))
-        self._cleanup_old_data()
+            timestamp = self.clock.now()
+        self.volume_history.append(timestamp.timestamp(), float(volume))
+        self._cleanup_old_data(timestamp)
         
     def record_trade(self, timestamp: Optional[datetime] = None):
         """Record trade execution"""
         if timestamp is None:
-            timestamp = datetime.now()
-        self.trade_history.append(timestamp)
-        self._cleanup_old_data()
-        
-    def _cleanup_old_data(self):
-        """Remove data older than 1 hour"""
-        cutoff_time = datetime.now() - timedelta(hours=1)
-        
-        self.price_history = [
-            (t, p) for t, p in self.price_history 
-            if t > cutoff_time
-        ]
-        self.volume_history = [
-            (t, v) for t, v in self.volume_history 
-            if t > cutoff_time
-        ]
-        self.trade_history = [
-            t for t in self.trade_history 
-            if t > cutoff_time
-        ]
-        
-    def _calculate_metrics(self) -> VolatilityMetrics:
+            timestamp = self.clock.now()
+        self.trade_history.append(timestamp.timestamp())
+        self._cleanup_old_data(timestamp)
+        
+    def _cleanup_old_data(self, now: datetime):
+        """Remove data older than 1 hour before now"""
+        cutoff_time = now.timestamp() - 3600
+        
+        self.price_history.expire(cutoff_time)
+        self.volume_history.expire(cutoff_time)
+        self.trade_history.expire(cutoff_time)
+        
+    def _calculate_metrics(self, now: Optional[datetime] = None) -> VolatilityMetrics:
         """Calculate current market metrics"""
-        now = datetime.now()
-        recent_window = timedelta(minutes=5)
+        if now is None:
+            now = self.clock.now()
+        self._recent_prices.update(now.timestamp())
+        self._recent_trades.update(now.timestamp())
         
         # Calculate price volatility
-        recent_prices = [
-            float(p) for t, p in self.price_history 
-            if now - t <= recent_window
-        ]
-        volatility = np.std(recent_prices) / np.mean(recent_prices) if recent_prices else 0
-        
-        # Calculate price change rate
-        if len(self.price_history) >= 2:
-            latest_price = float(self.price_history[-1][1])
-            earliest_price = float(self.price_history[0][1])
-            price_change = abs(latest_price - earliest_price) / earliest_price
-        else:
-            price_change = 0
-            
-        # Calculate volume change rate
-        if len(self.volume_history) >= 2:
-            latest_volume = float(self.volume_history[-1][1])
-            earliest_volume = float(self.volume_history[0][1])
-            volume_change = abs(latest_volume - earliest_volume) / earliest_volume
-        else:
-            volume_change = 0
-            
+        recent_prices = self._recent_prices
+        volatility = recent_prices.std / recent_prices.mean if recent_prices.count else 0
+        
+        # Calculate price and volume change rates
+        price_change = self._change_rate(self.price_history)
+        volume_change = self._change_rate(self.volume_history)
+        
         # Calculate trade frequency (trades per minute)
-        recent_trades = [
-            t for t in self.trade_history 
-            if now - t <= recent_window
-        ]
-        trade_frequency = len(recent_trades) / 5  # per minute
+        trade_frequency = self._recent_trades.count / 5  # per minute
         
-        return VolatilityMetrics(
+        metrics = VolatilityMetrics(
             current_volatility=volatility,
             price_change_rate=price_change,
             volume_change_rate=volume_change,
             trade_frequency=trade_frequency
         )
+        if self.verify_metrics:
+            self._verify_metrics(metrics, now)
+        return metrics
         
-    def should_break_circuit(self) -> tuple[bool, Optional[str]]:
+    @staticmethod
+    def _change_rate(history: TimeSeriesBuffer) -> float:
+        """Relative change between the oldest and newest samples"""
+        if len(history) < 2:
+            return 0
+        latest = history.last()[1]
+        earliest = history.first()[1]
+        return abs(latest - earliest) / earliest
+        
+    def _calculate_reference_metrics(self, now: datetime) -> VolatilityMetrics:
+        """Recompute metrics over the full window with numpy"""
+        window_start = (now - self.recent_window).timestamp()
+        
+        price_times = self.price_history.timestamps()
+        recent_prices = self.price_history.values()[price_times >= window_start]
+        volatility = np.std(recent_prices) / np.mean(recent_prices) if len(recent_prices) else 0
+        
+        recent_trades = np.count_nonzero(self.trade_history.timestamps() >= window_start)
+        
+        return VolatilityMetrics(
+            current_volatility=volatility,
+            price_change_rate=self._change_rate(self.price_history),
+            volume_change_rate=self._change_rate(self.volume_history),
+            trade_frequency=recent_trades / 5
+        )
+        
+    def _verify_metrics(self, metrics: VolatilityMetrics, now: datetime):
+        """Raise AssertionError if streaming metrics drift from the numpy reference"""
+        reference = self._calculate_reference_metrics(now)
+        for field in ('current_volatility', 'price_change_rate',
+                      'volume_change_rate', 'trade_frequency'):
+            streamed = getattr(metrics, field)
+            expected = getattr(reference, field)
+            if not math.isclose(streamed, expected, rel_tol=1e-6, abs_tol=1e-9):
+                raise AssertionError(
+                    f"Streaming {field} {streamed} does not match reference {expected}"
+                )
+        
+    def should_break_circuit(self, now: Optional[datetime] = None) -> tuple[bool, Optional[str]]:
         """Determine if circuit breaker should be activated"""
+        if now is None:
+            now = self.clock.now()
+            
         if self.is_active:
-            if self.last_break_time and datetime.now() - self.last_break_time >= self.cool_down_period:
+            if self.last_break_time and now - self.last_break_time >= self.cool_down_period:
                 self.is_active = False
                 return False, None
             return True, "Circuit breaker is active"
             
-        metrics = self._calculate_metrics()
+        metrics = self._calculate_metrics(now)
         
         # Check thresholds
         if metrics.current_volatility > self.volatility_threshold:
-            self._activate_circuit_breaker()
+            self._activate_circuit_breaker(now)
             return True, f"High volatility detected: {metrics.current_volatility:.2%}"
             
         if metrics.price_change_rate > self.price_change_threshold:
-            self._activate_circuit_breaker()
+            self._activate_circuit_breaker(now)
             return True, f"Excessive price change: {metrics.price_change_rate:.2%}"
             
         if metrics.volume_change_rate > self.volume_change_threshold:
-            self._activate_circuit_breaker()
+            self._activate_circuit_breaker(now)
             return True, f"Excessive volume change: {metrics.volume_change_rate:.2%}"
             
         if metrics.trade_frequency > self.trade_frequency_threshold:
-            self._activate_circuit_breaker()
+            self._activate_circuit_breaker(now)
             return True, f"High trade frequency: {metrics.trade_frequency:.1f} trades/min"
             
         return False, None
         
-    def _activate_circuit_breaker(self):
+    def _activate_circuit_breaker(self, now: datetime):
         """Activate the circuit breaker"""
         self.is_active = True
-        self.last_break_time = datetime.now()
+        self.last_break_time = now
         
-    def get_status(self) -> dict:
+    def get_status(self, now: Optional[datetime] = None) -> dict:
         """Get current circuit breaker status"""
-        metrics = self._calculate_metrics()
+        metrics = self._calculate_metrics(now)
         return {
             'is_active': self.is_active,
             'last_break_time': self.last_break_time.isoformat() if self.last_break_time else None,
@@ -0,0 +1,58 @@
+import time
+import asyncio
+from datetime import datetime
+
+class Clock:
+    """Wall-clock time source for the trading pipeline.
+
+    Components read time only through a clock, so a pipeline can share one
+    reading per tick and run under monotonic or simulated time.
+    """
+
+    def time(self) -> float:
+        """Current POSIX timestamp"""
+        return time.time()
+
+    def now(self) -> datetime:
+        """Current local time as a naive datetime"""
+        return datetime.fromtimestamp(self.time())
+
+    async def sleep(self, seconds: float):
+        """Wait for the given number of seconds"""
+        await asyncio.sleep(seconds)
+
+class MonotonicClock(Clock):
+    """Wall time anchored once and advanced by the monotonic clock.
+
+    Readings never step backwards when the system clock is adjusted, and
+    cost one monotonic read per call.
+    """
+
+    def __init__(self):
+        self._wall_anchor = time.time()
+        self._monotonic_anchor = time.monotonic()
+
+    def time(self) -> float:
+        return self._wall_anchor + (time.monotonic() - self._monotonic_anchor)
+
+class SimulatedClock(Clock):
+    """Clock that only moves when told to, for replay and tests"""
+
+    def __init__(self, start: float = 0.0):
+        self.current = start
+
+    def time(self) -> float:
+        return self.current
+
+    def set(self, timestamp: float):
+        """Jump to a timestamp; time never moves backwards"""
+        self.current = max(self.current, timestamp)
+
+    def advance(self, seconds: float):
+        """Move time forward"""
+        self.current += seconds
+
+    async def sleep(self, seconds: float):
+        # Skip ahead instead of waiting, but still yield to other tasks
+        self.advance(max(seconds, 0))
+        await asyncio.sleep(0)
@@ -0,0 +1,115 @@
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Callable, Dict, Optional, Union
+import orjson
+from monitoring import EVENT_QUEUE_DEPTH, EVENTS_DROPPED, EVENTS_COALESCED, EVENT_HANDLE_DELAY
+
+logger = logging.getLogger(__name__)
+
+# Delivery policies
+LATEST = 'latest'  # keep only the newest pending event
+FIFO = 'fifo'      # deliver every event in order, dropping the oldest when full
+
+class EventQueue:
+    """Bounded per-event-type queue that never blocks the producer"""
+
+    def __init__(self, event_type: str, policy: str = FIFO, maxsize: int = 1000):
+        if policy not in (LATEST, FIFO):
+            raise ValueError(f"Unknown delivery policy: {policy}")
+        self.event_type = event_type
+        self.policy = policy
+        self.items: deque = deque(maxlen=1 if policy == LATEST else maxsize)
+        self._ready = asyncio.Event()
+        self._depth = EVENT_QUEUE_DEPTH.labels(event_type=event_type)
+        self._dropped = EVENTS_DROPPED.labels(event_type=event_type)
+        self._coalesced = EVENTS_COALESCED.labels(event_type=event_type)
+        self._delay = EVENT_HANDLE_DELAY.labels(event_type=event_type)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def put(self, data: dict, received_at: Optional[float] = None):
+        """Enqueue an event, replacing or evicting the oldest one when full"""
+        if len(self.items) == self.items.maxlen:
+            if self.policy == LATEST:
+                self._coalesced.inc()
+            else:
+                self._dropped.inc()
+        self.items.append((received_at or time.monotonic(), data))
+        self._depth.set(len(self.items))
+        self._ready.set()
+
+    async def get(self) -> dict:
+        """Wait for and remove the oldest queued event"""
+        while not self.items:
+            self._ready.clear()
+            await self._ready.wait()
+        received_at, data = self.items.popleft()
+        self._depth.set(len(self.items))
+        self._delay.observe(time.monotonic() - received_at)
+        return data
+
+class EventDispatcher:
+    """Routes decoded WebSocket messages to subscribers through per-type queues.
+
+    The socket reader only decodes and enqueues, so a slow handler never
+    stalls it. Each event type has its own worker task that awaits the
+    subscriber callbacks in order.
+    """
+
+    def __init__(self, policies: Optional[Dict[str, str]] = None,
+                 default_policy: str = FIFO, maxsize: int = 1000):
+        self.policies = policies or {}
+        self.default_policy = default_policy
+        self.maxsize = maxsize
+        self.subscribers: Dict[str, list[Callable]] = {}
+        self.queues: Dict[str, EventQueue] = {}
+        self.workers: Dict[str, asyncio.Task] = {}
+
+    def subscribe(self, event_type: str, callback: Callable):
+        """Register an async callback for an event type"""
+        if event_type not in self.subscribers:
+            self.subscribers[event_type] = []
+            self.queues[event_type] = EventQueue(
+                event_type,
+                self.policies.get(event_type, self.default_policy),
+                self.maxsize
+            )
+        self.subscribers[event_type].append(callback)
+
+    def start(self):
+        """Start a worker task for every subscribed event type"""
+        for event_type, queue in self.queues.items():
+            worker = self.workers.get(event_type)
+            if worker is None or worker.done():
+                self.workers[event_type] = asyncio.create_task(
+                    self._worker(event_type, queue)
+                )
+
+    async def stop(self):
+        """Cancel all worker tasks"""
+        for worker in self.workers.values():
+            worker.cancel()
+        await asyncio.gather(*self.workers.values(), return_exceptions=True)
+        self.workers.clear()
+
+    def dispatch(self, message: Union[str, bytes]):
+        """Decode a raw message and enqueue it for its subscribers"""
+        received_at = time.monotonic()
+        data = orjson.loads(message)
+        if not isinstance(data, dict):
+            return
+        queue = self.queues.get(data.get('type'))
+        if queue is not None:
+            queue.put(data, received_at)
+
+    async def _worker(self, event_type: str, queue: EventQueue):
+        while True:
+            data = await queue.get()
+            for callback in self.subscribers[event_type]:
+                try:
+                    await callback(data)
+                except Exception as e:
+                    logger.error(f"{event_type} handler failed: {e}")
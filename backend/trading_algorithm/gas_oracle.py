@@ -0,0 +1,72 @@
+import time
+import asyncio
+import logging
+from typing import Optional
+from web3 import Web3
+from tatum_utils import AsyncTatumProvider
+from trade_optimizer import TradeOptimizer
+from monitoring import MonitoringService
+
+logger = logging.getLogger(__name__)
+
+class GasOracle:
+    """Polls the network gas price on a fixed cadence and serves it from cache.
+
+    Every observation is fed to the TradeOptimizer history and the gas price
+    gauge in Gwei. The trade path reads the cached price in wei and only
+    goes to the network when the cache is older than `max_age` seconds.
+    """
+
+    def __init__(self, provider: AsyncTatumProvider,
+                 optimizer: TradeOptimizer,
+                 monitoring: MonitoringService,
+                 interval: float = 15.0,
+                 max_age: float = 60.0):
+        self.provider = provider
+        self.optimizer = optimizer
+        self.monitoring = monitoring
+        self.interval = interval
+        self.max_age = max_age
+        self.gas_price: Optional[int] = None  # wei
+        self.updated_at: Optional[float] = None
+        self._refresh_lock = asyncio.Lock()
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the cached price was fetched"""
+        if self.updated_at is None:
+            return None
+        return time.monotonic() - self.updated_at
+
+    async def refresh(self) -> int:
+        """Fetch the current gas price and record it"""
+        gas_price = await self.provider.get_gas_price()
+        self.gas_price = gas_price
+        self.updated_at = time.monotonic()
+
+        gas_price_gwei = int(round(Web3.from_wei(gas_price, 'gwei')))
+        self.optimizer.add_gas_price(gas_price_gwei)
+        self.monitoring.update_gas_price(gas_price_gwei)
+        return gas_price
+
+    async def get_gas_price(self, max_age: Optional[float] = None) -> int:
+        """Cached gas price in wei, refreshed first if older than max_age"""
+        max_age = self.max_age if max_age is None else max_age
+        age = self.age
+        if age is not None and age <= max_age:
+            return self.gas_price
+        async with self._refresh_lock:
+            # Another caller may have refreshed while we waited
+            age = self.age
+            if age is not None and age <= max_age:
+                return self.gas_price
+            return await self.refresh()
+
+    async def run(self):
+        """Background polling loop"""
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"Gas price refresh failed: {e}")
+            await asyncio.sleep(self.interval)
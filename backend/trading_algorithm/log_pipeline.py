@@ -0,0 +1,172 @@
+import os
+import sys
+import time
+import queue
+import atexit
+import logging
+import threading
+from collections import Counter as EventCounts
+from typing import BinaryIO, Dict, Optional
+import orjson
+import structlog
+from prometheus_client import Counter
+
+LOG_RECORDS_DROPPED = Counter('log_records_dropped', 'Log records not written', ['reason'])
+
+# Seconds between lines of the per-tick events; everything else is logged in full
+DEFAULT_RATE_LIMITS = {
+    'price_updated': 5.0,
+    'volume_updated': 5.0,
+    'gas_price_updated': 5.0,
+}
+
+_STOP = object()
+
+class EventRateLimiter:
+    """structlog processor that lets through at most one line per event per interval.
+
+    Suppressed lines are counted, and the next line of that event carries
+    the count as `suppressed`.
+    """
+
+    def __init__(self, intervals: Dict[str, float]):
+        self.intervals = intervals
+        self.next_allowed: Dict[str, float] = {}
+        self.suppressed: EventCounts = EventCounts()
+        self._dropped = LOG_RECORDS_DROPPED.labels(reason='rate_limited')
+
+    def __call__(self, logger, method_name: str, event_dict: dict) -> dict:
+        event = event_dict.get('event')
+        interval = self.intervals.get(event)
+        if interval is None:
+            return event_dict
+        now = time.monotonic()
+        if now < self.next_allowed.get(event, 0.0):
+            self.suppressed[event] += 1
+            self._dropped.inc()
+            raise structlog.DropEvent
+        self.next_allowed[event] = now + interval
+        if event in self.suppressed:
+            event_dict['suppressed'] = self.suppressed.pop(event)
+        return event_dict
+
+def add_timestamp(logger, method_name: str, event_dict: dict) -> dict:
+    """Stamp records with POSIX time at the call site, not when written"""
+    event_dict['timestamp'] = time.time()
+    return event_dict
+
+class LogWriter:
+    """Background thread that renders queued records with orjson and writes them in batches.
+
+    Callers only enqueue the event dict. When the bounded queue is full the
+    record is dropped and counted rather than blocking the event loop.
+    """
+
+    def __init__(self, stream: Optional[BinaryIO] = None,
+                 maxsize: int = 10000, batch_size: int = 256):
+        self.stream = stream or sys.stdout.buffer
+        self.batch_size = batch_size
+        self.queue: queue.Queue = queue.Queue(maxsize)
+        self._dropped = LOG_RECORDS_DROPPED.labels(reason='queue_full')
+        self._thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+        self._thread.start()
+
+    def put(self, event_dict: dict):
+        try:
+            self.queue.put_nowait(event_dict)
+        except queue.Full:
+            self._dropped.inc()
+
+    @staticmethod
+    def render(event_dict: dict) -> bytes:
+        return orjson.dumps(
+            event_dict,
+            default=str,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+        )
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = _STOP in batch
+            lines = [self.render(record) for record in batch if record is not _STOP]
+            try:
+                self.stream.write(b''.join(lines))
+                self.stream.flush()
+            except Exception:
+                self._dropped.inc(len(lines))
+            if stop:
+                return
+
+    def close(self, timeout: float = 5.0):
+        """Write out everything queued so far and stop the thread"""
+        if self._thread.is_alive():
+            self.queue.put(_STOP)
+            self._thread.join(timeout)
+
+class QueueLogger:
+    """structlog logger that hands the processed event dict to a LogWriter"""
+
+    def __init__(self, writer: LogWriter):
+        self.writer = writer
+
+    def msg(self, **event_dict):
+        self.writer.put(event_dict)
+
+    debug = info = warning = warn = error = critical = exception = fatal = log = msg
+
+class StructlogHandler(logging.Handler):
+    """stdlib logging handler that forwards records into the structlog pipeline.
+
+    Records from modules that use `logging.getLogger(__name__)` then get
+    the same rate limiting, context variables (such as `trade_id`) and
+    background writer as structlog events.
+    """
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            event_dict = {'logger': record.name}
+            if record.exc_info:
+                event_dict['exc_info'] = record.exc_info
+            structlog.get_logger().log(record.levelno, record.getMessage(), **event_dict)
+        except Exception:
+            self.handleError(record)
+
+def configure_logging(level: Optional[str] = None,
+                      rate_limits: Optional[Dict[str, float]] = None,
+                      queue_size: Optional[int] = None,
+                      stream: Optional[BinaryIO] = None) -> LogWriter:
+    """Route structlog and stdlib logging through the rate limiter and a background orjson writer"""
+    level = level or os.getenv('LOG_LEVEL', 'INFO')
+    if rate_limits is None:
+        rate_limits = dict(DEFAULT_RATE_LIMITS)
+        interval = os.getenv('LOG_PRICE_INTERVAL')
+        if interval is not None:
+            rate_limits.update({event: float(interval) for event in DEFAULT_RATE_LIMITS})
+    writer = LogWriter(
+        stream=stream,
+        maxsize=queue_size or int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+    )
+    atexit.register(writer.close)
+
+    structlog.configure(
+        processors=[
+            EventRateLimiter(rate_limits),
+            structlog.contextvars.merge_contextvars,
+            structlog.processors.add_log_level,
+            add_timestamp,
+            structlog.processors.format_exc_info,
+        ],
+        wrapper_class=structlog.make_filtering_bound_logger(
+            logging.getLevelName(level.upper())
+        ),
+        logger_factory=lambda *args: QueueLogger(writer),
+        cache_logger_on_first_use=True
+    )
+    logging.basicConfig(level=level.upper(), handlers=[StructlogHandler()], force=True)
+    return writer
@@ -1,5 +1,5 @@
 import time
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from prometheus_client import start_http_server, Counter, Gauge, Histogram
 import structlog
 from datetime import datetime
@@ -16,9 +16,45 @@ TRADE_DURATION = Histogram('trade_duration_seconds', 'Time taken to execute trad
 PRICE_GAUGE = Gauge('current_price', 'Current token price')
 VOLUME_GAUGE = Gauge('current_volume', 'Current token volume')
 GAS_PRICE_GAUGE = Gauge('current_gas_price', 'Current gas price in Gwei')
+EVENT_QUEUE_DEPTH = Gauge('ws_event_queue_depth', 'Queued WebSocket events awaiting handlers', ['event_type'])
+EVENTS_DROPPED = Counter('ws_events_dropped', 'WebSocket events dropped from a full queue', ['event_type'])
+EVENTS_COALESCED = Counter('ws_events_coalesced', 'WebSocket events superseded by a newer one', ['event_type'])
+EVENT_HANDLE_DELAY = Histogram(
+    'ws_event_handle_delay_seconds', 'Time from receiving a WebSocket event to handling it', ['event_type'],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+EVENT_LOOP_LAG = Histogram(
+    'event_loop_lag_seconds', 'Delay of event loop wakeups past their scheduled time',
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+)
+TASKS_PENDING = Gauge('asyncio_tasks_pending', 'Unfinished asyncio tasks on the event loop')
+EXECUTOR_QUEUE_DEPTH = Gauge('executor_queue_depth', 'Work items waiting for an executor thread', ['executor'])
+EXECUTOR_BUSY_WORKERS = Gauge('executor_busy_workers', 'Executor threads running a work item', ['executor'])
+EXECUTOR_MAX_WORKERS = Gauge('executor_max_workers', 'Executor thread pool size', ['executor'])
+EXECUTOR_QUEUE_WAIT = Histogram(
+    'executor_queue_wait_seconds', 'Time work items wait for an executor thread', ['executor'],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5)
+)
+TX_TIME_TO_INCLUSION = Histogram(
+    'tx_time_to_inclusion_seconds', 'Time from first broadcast of a nonce to its receipt',
+    buckets=(1, 2, 4, 6, 10, 15, 20, 30, 45, 60, 90, 120, 180, 300)
+)
+TX_REPLACEMENTS = Counter('tx_replacements_total', 'Stuck transactions rebroadcast at a higher fee', ['urgency'])
+RPC_ENDPOINT_LATENCY = Gauge('rpc_endpoint_latency_seconds', 'Smoothed request latency per Tatum endpoint', ['endpoint'])
+RPC_ENDPOINT_ERROR_RATE = Gauge('rpc_endpoint_error_rate', 'Smoothed request failure rate per Tatum endpoint', ['endpoint'])
+RPC_HEDGED_REQUESTS = Counter('rpc_hedged_requests', 'Reads sent to another endpoint after a slow or failed one')
+RPC_HEDGE_WINS = Counter('rpc_hedge_wins', 'Hedged reads answered by the hedge rather than the first endpoint')
+WS_RECONNECT_GAP = Histogram(
+    'ws_reconnect_gap_seconds', 'Time without a subscribed WebSocket connection per reconnect', ['path'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+)
+TRADE_STAGE_DURATION = Histogram(
+    'trade_stage_duration_seconds', 'Time spent in each stage of trade execution', ['stage'],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+)
 
 class MonitoringService:
-    def __init__(self, metrics_port: int = 8000):
+    def __init__(self, metrics_port: Optional[int] = 8000):
         self.start_time = time.time()
         self.metrics: Dict[str, Any] = {
             'uptime_seconds': 0,
@@ -29,8 +65,9 @@ class MonitoringService:
             'average_trade_duration': 0
         }
         
-        # Start Prometheus metrics server
-        start_http_server(metrics_port)
+        # Start Prometheus metrics server (None to skip, e.g. for offline replay)
+        if metrics_port is not None:
+            start_http_server(metrics_port)
         
         logger.info("monitoring_service_started",
                    metrics_port=metrics_port,
@@ -63,8 +100,7 @@ class MonitoringService:
         logger.info("trade_recorded",
                    success=success,
                    gas_used=gas_used,
-                   duration=duration,
-                   metrics=self.metrics)
+                   duration=duration)
 
     def update_price(self, price: float):
         """Update current price metric"""
@@ -84,7 +120,7 @@ class MonitoringService:
     def get_metrics(self) -> Dict[str, Any]:
         """Get current metrics"""
         self.metrics['uptime_seconds'] = int(time.time() - self.start_time)
-        return self.metrics
+        return dict(self.metrics)
 
     def log_error(self, error: Exception, context: Dict[str, Any] = None):
         """Log error with context"""
@@ -92,16 +128,13 @@ class MonitoringService:
                     error_type=type(error).__name__,
                     error_message=str(error),
                     context=context or {},
-                    metrics=self.metrics)
+                    # A snapshot, since the writer renders it later on its own thread
+                    metrics=dict(self.metrics))
 
     def log_warning(self, message: str, context: Dict[str, Any] = None):
         """Log warning with context"""
-        logger.warning(message,
-                      context=context or {},
-                      metrics=self.metrics)
+        logger.warning(message, context=context or {})
 
     def log_info(self, message: str, context: Dict[str, Any] = None):
         """Log info with context"""
-        logger.info(message,
-                   context=context or {},
-                   metrics=self.metrics) 
\ No newline at end of file
+        logger.info(message, context=context or {}) 
\ No newline at end of file
@@ -0,0 +1,55 @@
+import asyncio
+from typing import Optional, Set
+from tatum_utils import AsyncTatumProvider
+
+class NonceManager:
+    """Hands out sequential nonces locally after a single chain lookup.
+
+    Every allocated nonce stays outstanding until it is completed (its
+    transaction was mined or given up on) or released (it was never
+    broadcast). The chain nonce is the node's pending transaction count,
+    and a resync never goes below the highest nonce still outstanding, so
+    splits in flight keep their nonces.
+    """
+
+    def __init__(self, provider: AsyncTatumProvider, address: str):
+        self.provider = provider
+        self.address = address
+        self.outstanding: Set[int] = set()
+        self._next_nonce: Optional[int] = None
+        self._released: Set[int] = set()
+        self._lock = asyncio.Lock()
+
+    async def allocate(self) -> int:
+        """Reserve the next nonce, fetching it from the chain on first use"""
+        async with self._lock:
+            if self._next_nonce is None:
+                self._next_nonce = await self.provider.get_pending_nonce(self.address)
+            nonce = self._next_nonce
+            self._next_nonce += 1
+            self.outstanding.add(nonce)
+            return nonce
+
+    def complete(self, nonce: int):
+        """Stop counting a broadcast nonce as outstanding"""
+        self.outstanding.discard(nonce)
+
+    def release(self, nonce: int):
+        """Hand back a nonce that was never broadcast.
+
+        It is reused once every nonce allocated after it has been released
+        too; otherwise it stays a gap until the next resync.
+        """
+        self.outstanding.discard(nonce)
+        self._released.add(nonce)
+        while self._next_nonce is not None and self._next_nonce - 1 in self._released:
+            self._next_nonce -= 1
+            self._released.discard(self._next_nonce)
+
+    async def resync(self) -> int:
+        """Reload the next nonce once the chain proved ours wrong, e.g. with a "nonce too low" rejection"""
+        async with self._lock:
+            pending = await self.provider.get_pending_nonce(self.address)
+            self._next_nonce = max([pending, *(nonce + 1 for nonce in self.outstanding)])
+            self._released.clear()
+            return self._next_nonce
@@ -0,0 +1,167 @@
+import math
+import time
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from web3 import Web3
+from tatum_utils import AsyncTatumProvider, is_nonce_error, to_int
+from receipt_tracker import ReceiptTracker, ReceiptTimeout
+from signing import SigningService
+from trade_optimizer import TradeOptimizer
+from monitoring import TX_TIME_TO_INCLUSION, TX_REPLACEMENTS
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class PendingTransaction:
+    transaction: dict
+    gas_price: int  # wei, of the latest broadcast
+    level: int  # index into the gas strategy ladder
+    broadcast_block: Optional[int]
+    first_broadcast: float = field(default_factory=time.monotonic)
+    tx_hashes: List[str] = field(default_factory=list)
+    replacements: int = 0
+    replacing: bool = False
+    included: Optional[asyncio.Future] = None
+
+class PendingTransactionManager:
+    """Replaces transactions that sit unmined with higher-fee versions of the same nonce.
+
+    Every broadcast is tracked per nonce with the block it was sent in and
+    its gas price. On each BLOCK_MINED event, a transaction still pending
+    after `stuck_blocks` blocks is re-signed and rebroadcast at the next
+    rung of the TradeOptimizer gas strategy ladder (low, medium, high,
+    urgent), and at least `bump` times its previous price so nodes accept
+    it as a replacement. Replacements due in the same block are broadcast
+    concurrently. The receipt of whichever version is mined resolves the
+    transaction.
+    """
+
+    def __init__(self, provider: AsyncTatumProvider,
+                 receipt_tracker: ReceiptTracker,
+                 signer: SigningService,
+                 optimizer: TradeOptimizer,
+                 stuck_blocks: int = 5,
+                 bump: float = 1.125):
+        self.provider = provider
+        self.receipt_tracker = receipt_tracker
+        self.signer = signer
+        self.optimizer = optimizer
+        self.stuck_blocks = stuck_blocks
+        self.bump = bump
+        self.levels = list(optimizer.gas_strategies)
+        self.block_number: Optional[int] = None
+        self.by_nonce: Dict[int, PendingTransaction] = {}
+        self.by_hash: Dict[str, PendingTransaction] = {}
+
+    def _ladder_price(self, level: int) -> int:
+        """Gas price in wei the optimizer currently suggests for a ladder rung"""
+        return Web3.to_wei(self.optimizer.get_optimal_gas_price(self.levels[level]), 'gwei')
+
+    def _level_for(self, gas_price: int) -> int:
+        """Highest rung whose suggested price the given price already meets"""
+        level = 0
+        for i in range(len(self.levels)):
+            if self._ladder_price(i) <= gas_price:
+                level = i
+        return level
+
+    def add(self, transaction: dict, tx_hash: str) -> PendingTransaction:
+        """Start tracking a broadcast transaction"""
+        pending = PendingTransaction(
+            transaction=dict(transaction),
+            gas_price=transaction['gasPrice'],
+            level=self._level_for(transaction['gasPrice']),
+            broadcast_block=self.block_number,
+            included=asyncio.get_running_loop().create_future()
+        )
+        self.by_nonce[transaction['nonce']] = pending
+        self._watch(pending, tx_hash)
+        return pending
+
+    def _watch(self, pending: PendingTransaction, tx_hash: str):
+        pending.tx_hashes.append(tx_hash)
+        self.by_hash[tx_hash] = pending
+        future = self.receipt_tracker.track(tx_hash)
+        future.add_done_callback(lambda f: self._on_receipt(pending, f))
+
+    def _on_receipt(self, pending: PendingTransaction, future: asyncio.Future):
+        if future.cancelled() or future.exception() is not None or pending.included.done():
+            return
+        pending.included.set_result(future.result())
+        TX_TIME_TO_INCLUSION.observe(time.monotonic() - pending.first_broadcast)
+        self._stop_tracking(pending)
+
+    def _stop_tracking(self, pending: PendingTransaction):
+        """Drop the nonce and stop polling receipts for its other versions"""
+        if self.by_nonce.get(pending.transaction['nonce']) is pending:
+            del self.by_nonce[pending.transaction['nonce']]
+        for tx_hash in pending.tx_hashes:
+            self.receipt_tracker.untrack(tx_hash)
+
+    async def wait_for(self, tx_hash: str, timeout: Optional[float] = None) -> dict:
+        """Wait for the receipt of any version of a transaction until the deadline passes"""
+        pending = self.by_hash[tx_hash]
+        timeout = self.receipt_tracker.timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(asyncio.shield(pending.included), timeout)
+        except asyncio.TimeoutError:
+            self._stop_tracking(pending)
+            raise ReceiptTimeout(f"Transaction {tx_hash} not mined within {timeout}s "
+                                 f"after {pending.replacements} replacements")
+        finally:
+            for version in pending.tx_hashes:
+                self.by_hash.pop(version, None)
+
+    async def on_block(self, data: dict):
+        """BLOCK_MINED event handler; replaces transactions pending too long, all at once"""
+        self.block_number = to_int(data['blockNumber'])
+        stuck = []
+        for pending in list(self.by_nonce.values()):
+            if pending.broadcast_block is None:
+                pending.broadcast_block = self.block_number
+            elif (self.block_number - pending.broadcast_block >= self.stuck_blocks
+                  and not pending.replacing):
+                stuck.append(pending)
+        await asyncio.gather(*(self.replace(pending) for pending in stuck))
+
+    async def replace(self, pending: PendingTransaction):
+        """Re-sign and rebroadcast a pending transaction one rung up the gas ladder"""
+        if pending.included.done() or pending.level + 1 >= len(self.levels):
+            return
+        level = pending.level + 1
+        gas_price = max(self._ladder_price(level), math.ceil(pending.gas_price * self.bump))
+        transaction = {**pending.transaction, 'gasPrice': gas_price}
+        nonce = transaction['nonce']
+
+        # Wait another stuck_blocks before trying again, whatever happens,
+        # and never run two replacements of one nonce at once
+        pending.broadcast_block = self.block_number
+        pending.replacing = True
+        try:
+            signed_tx = await self.signer.sign(transaction)
+            tx_hash = await self.provider.broadcast_signed_transaction(
+                signed_tx.rawTransaction.hex()
+            )
+        except Exception as e:
+            if is_nonce_error(e):
+                # Mined already, or our bump was too small; climb anyway
+                pending.level, pending.gas_price = level, gas_price
+            logger.warning(f"Replacing transaction with nonce {nonce} failed: {e}")
+            return
+        finally:
+            pending.replacing = False
+        if pending.included.done():
+            # An earlier version was mined while we were signing
+            return
+
+        logger.warning(
+            f"Nonce {nonce} pending for {self.stuck_blocks} blocks, replaced at "
+            f"{Web3.from_wei(gas_price, 'gwei')} Gwei ({self.levels[level]}): {tx_hash}"
+        )
+        pending.transaction = transaction
+        pending.level, pending.gas_price = level, gas_price
+        pending.replacements += 1
+        TX_REPLACEMENTS.labels(urgency=self.levels[level]).inc()
+        self._watch(pending, tx_hash)
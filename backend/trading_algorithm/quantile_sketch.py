@@ -0,0 +1,74 @@
+import math
+from collections import Counter, deque
+from typing import Iterable, List
+
+class SlidingQuantileSketch:
+    """Quantile sketch over a sliding time window with bounded memory.
+
+    Values are counted in logarithmic buckets (as in DDSketch), so every
+    quantile estimate is within `relative_accuracy` of a true sample value.
+    The window is split into panes; each pane keeps its own bucket counts and
+    is subtracted from the running totals once it lies entirely before the
+    window, so the window is rounded out to whole panes. Memory depends on
+    the value range and pane count, not on how many samples arrive.
+    """
+
+    def __init__(self, window_seconds: float = 86400,
+                 pane_seconds: float = 3600,
+                 relative_accuracy: float = 0.01):
+        self.window_seconds = window_seconds
+        self.pane_seconds = pane_seconds
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.totals: Counter = Counter()
+        self.count = 0
+        self.panes: deque = deque()  # (pane id, Counter)
+
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(max(value, 1e-9)) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, value: float, timestamp: float):
+        """Record a sample observed at timestamp"""
+        pane_id = int(timestamp // self.pane_seconds)
+        self.expire(timestamp)
+        if not self.panes or self.panes[-1][0] < pane_id:
+            self.panes.append((pane_id, Counter()))
+        key = self._key(value)
+        self.panes[-1][1][key] += 1
+        self.totals[key] += 1
+        self.count += 1
+
+    def expire(self, now: float):
+        """Drop panes that end before the window ending at now starts.
+
+        The pane straddling the start of the window is kept whole, so the
+        sketch covers at least `window_seconds` and at most one pane more.
+        """
+        oldest_pane = int((now - self.window_seconds) // self.pane_seconds)
+        while self.panes and self.panes[0][0] < oldest_pane:
+            _, pane = self.panes.popleft()
+            self.totals.subtract(pane)
+            self.count -= sum(pane.values())
+        # Counter.subtract leaves zero entries behind
+        if len(self.totals) > 2 * sum(1 for c in self.totals.values() if c > 0):
+            self.totals = +self.totals
+
+    def quantiles(self, qs: Iterable[float]) -> List[float]:
+        """Estimate the given quantiles (0..1), in the order requested"""
+        if not self.count:
+            return []
+        targets = sorted((q * (self.count - 1), i) for i, q in enumerate(qs))
+        results = [0.0] * len(targets)
+        cumulative = 0
+        t = 0
+        for key in sorted(self.totals):
+            cumulative += self.totals[key]
+            while t < len(targets) and targets[t][0] < cumulative:
+                results[targets[t][1]] = self._value(key)
+                t += 1
+            if t == len(targets):
+                break
+        return results
@@ -0,0 +1,84 @@
+import asyncio
+import time
+import logging
+from typing import Dict, Optional
+from tatum_utils import AsyncTatumProvider
+
+logger = logging.getLogger(__name__)
+
+class ReceiptTimeout(Exception):
+    """Raised when a transaction is not mined before its deadline"""
+
+class ReceiptTracker:
+    """Resolves transaction receipts in one batch per mined block.
+
+    Pending hashes are checked together whenever a BLOCK_MINED event
+    arrives, so HTTP load stays at one request per block no matter how many
+    transactions are in flight. `run` polls on a slow fallback cadence in
+    case block events stop arriving.
+    """
+
+    def __init__(self, provider: AsyncTatumProvider,
+                 timeout: float = 300.0,
+                 fallback_interval: float = 10.0):
+        self.provider = provider
+        self.timeout = timeout
+        self.fallback_interval = fallback_interval
+        self.pending: Dict[str, asyncio.Future] = {}
+        self.last_check = time.monotonic()
+        self._checking = False
+
+    def track(self, tx_hash: str) -> asyncio.Future:
+        """Start tracking a transaction, returning the future for its receipt"""
+        future = self.pending.get(tx_hash)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self.pending[tx_hash] = future
+        return future
+
+    def untrack(self, tx_hash: str):
+        """Stop checking a transaction, e.g. one replaced by another version"""
+        future = self.pending.pop(tx_hash, None)
+        if future is not None and not future.done():
+            future.cancel()
+
+    async def wait_for(self, tx_hash: str, timeout: Optional[float] = None) -> dict:
+        """Wait for the receipt of a transaction until the deadline passes"""
+        future = self.track(tx_hash)
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            self.pending.pop(tx_hash, None)
+            raise ReceiptTimeout(f"Transaction {tx_hash} not mined within {timeout}s")
+
+    async def on_block(self, data: dict):
+        """BLOCK_MINED event handler"""
+        await self.check_pending()
+
+    async def check_pending(self):
+        """Fetch receipts for all pending transactions in one batch"""
+        if self._checking or not self.pending:
+            return
+        self._checking = True
+        self.last_check = time.monotonic()
+        try:
+            tx_hashes = list(self.pending)
+            receipts = await self.provider.get_transaction_receipts(tx_hashes)
+            for tx_hash, receipt in zip(tx_hashes, receipts):
+                if not receipt:
+                    continue
+                future = self.pending.pop(tx_hash, None)
+                if future is not None and not future.done():
+                    future.set_result(receipt)
+        except Exception as e:
+            logger.warning(f"Receipt batch check failed: {e}")
+        finally:
+            self._checking = False
+
+    async def run(self):
+        """Fallback polling loop for when block events go quiet"""
+        while True:
+            await asyncio.sleep(self.fallback_interval)
+            if time.monotonic() - self.last_check >= self.fallback_interval:
+                await self.check_pending()
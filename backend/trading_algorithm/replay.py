@@ -0,0 +1,249 @@
+"""Offline replay of recorded market data through the real decision pipeline.
+
+Feeds a tick file of prices, gas prices and token supply through
+TradingAlgorithm.handle_price_update, CircuitBreaker and TradeOptimizer
+under a simulated clock, with ReplayProvider standing in for Tatum. Runs
+as fast as the decision code allows and reports throughput and the trades
+that would have been made.
+
+Tick files are CSV with a header, or JSON lines, with the fields
+timestamp (POSIX seconds or ISO 8601), price (USD), gas_price (Gwei) and
+supply (tokens):
+
+    python replay.py ticks.csv [--trades-out trades.jsonl] [--verbose]
+"""
+import csv
+import time
+import asyncio
+import logging
+import argparse
+from decimal import Decimal
+from datetime import datetime
+from dataclasses import dataclass, field, asdict
+from typing import Callable, Dict, List, Optional
+import orjson
+import structlog
+from web3 import Web3
+from eth_account import Account
+from clock import SimulatedClock
+from monitoring import MonitoringService
+from trading_algorithm import TradingAlgorithm
+from tx_templates import function_selector
+
+@dataclass
+class Tick:
+    timestamp: float
+    price: Decimal
+    gas_price: Decimal  # Gwei
+    supply: Decimal
+
+@dataclass
+class ReplayTrade:
+    timestamp: float
+    size: Decimal
+    is_mint: bool
+    gas_price: Optional[int]
+    market_price: Decimal
+
+@dataclass
+class ReplayReport:
+    ticks: int
+    wall_seconds: float
+    simulated_seconds: float
+    trades: List[ReplayTrade] = field(default_factory=list)
+    tick_latencies: List[float] = field(default_factory=list)
+
+    @property
+    def ticks_per_second(self) -> float:
+        return self.ticks / self.wall_seconds if self.wall_seconds else 0.0
+
+    def latency_percentile(self, q: float) -> float:
+        """Tick handling latency percentile in milliseconds"""
+        if not self.tick_latencies:
+            return 0.0
+        ordered = sorted(self.tick_latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+def _parse_timestamp(value) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+def load_ticks(path: str) -> List[Tick]:
+    """Read a CSV or JSON lines tick file, sorted by time"""
+    with open(path) as f:
+        if path.endswith('.csv'):
+            rows = list(csv.DictReader(f))
+        else:
+            rows = [orjson.loads(line) for line in f if line.strip()]
+    ticks = [
+        Tick(
+            timestamp=_parse_timestamp(row['timestamp']),
+            price=Decimal(str(row['price'])),
+            gas_price=Decimal(str(row['gas_price'])),
+            supply=Decimal(str(row['supply']))
+        )
+        for row in rows
+    ]
+    ticks.sort(key=lambda tick: tick.timestamp)
+    return ticks
+
+class ReplayProvider:
+    """In-memory stand-in for AsyncTatumProvider driven by the current tick"""
+
+    def __init__(self, balance: Decimal = Decimal('1e9'), gas_used: int = 60000):
+        self.tick: Optional[Tick] = None
+        self.balance = balance
+        self.gas_used = gas_used
+        self.nonce = 0
+        self.block_number = 0
+        self.receipts: Dict[str, dict] = {}
+        self.on_broadcast: Optional[Callable[[str], None]] = None
+        self._selectors = {
+            function_selector('getLatestPrice()'): lambda: int(self.tick.price * Decimal(1e8)),
+            function_selector('totalSupply()'): lambda: int(self.tick.supply * Decimal(1e18)),
+            function_selector('balanceOf(address)'): lambda: int(self.balance * Decimal(1e18)),
+        }
+
+    async def close(self):
+        pass
+
+    async def get_gas_price(self) -> int:
+        return Web3.to_wei(self.tick.gas_price, 'gwei')
+
+    async def get_nonce(self, address: str) -> int:
+        return self.nonce
+
+    async def get_pending_nonce(self, address: str) -> int:
+        return self.nonce
+
+    async def estimate_gas(self, from_address: str, to_address: str, data: str) -> int:
+        return self.gas_used
+
+    async def broadcast_signed_transaction(self, signed_tx: str) -> str:
+        tx_hash = Web3.keccak(hexstr=signed_tx).hex()
+        self.nonce += 1
+        self.block_number += 1
+        self.receipts[tx_hash] = {
+            'transactionHash': tx_hash,
+            'blockNumber': self.block_number,
+            'gasUsed': self.gas_used,
+            'status': 1
+        }
+        if self.on_broadcast:
+            self.on_broadcast(tx_hash)
+        return tx_hash
+
+    async def get_transaction_receipt(self, tx_hash: str) -> Optional[dict]:
+        return self.receipts.get(tx_hash)
+
+    async def get_transaction_receipts(self, tx_hashes: list[str]) -> list[Optional[dict]]:
+        return [self.receipts.get(tx_hash) for tx_hash in tx_hashes]
+
+    async def batch_call(self, calls: list[tuple[str, str]], block: str = 'latest') -> list[str]:
+        return [hex(self._selectors[data[2:10]]()) for _, data in calls]
+
+class ReplayEngine:
+    """Drives recorded ticks through a TradingAlgorithm on simulated time"""
+
+    def __init__(self, ticks: List[Tick], balance: Decimal = Decimal('1e9')):
+        self.ticks = ticks
+        self.clock = SimulatedClock(ticks[0].timestamp if ticks else 0.0)
+        self.provider = ReplayProvider(balance=balance)
+        self.algorithm = TradingAlgorithm(
+            tatum_async=self.provider,
+            monitoring=MonitoringService(metrics_port=None),
+            clock=self.clock,
+            contract_abi=[],
+            private_key=Account.create().key.hex(),
+            master_control_address='0x' + '00' * 19 + '01'
+        )
+        self.trades: List[ReplayTrade] = []
+        self._record_trades()
+
+    def _record_trades(self):
+        """Capture every submitted transaction and settle it on the next loop turn"""
+        algorithm = self.algorithm
+        submit_trade = algorithm.submit_trade
+
+        async def recording_submit_trade(size: Decimal, is_mint: bool,
+                                         gas_price: Optional[int] = None,
+                                         prepared=None) -> str:
+            tx_hash = await submit_trade(size, is_mint, gas_price, prepared=prepared)
+            self.provider.balance += size if is_mint else -size
+            self.trades.append(ReplayTrade(
+                timestamp=self.clock.time(),
+                size=size,
+                is_mint=is_mint,
+                gas_price=gas_price,
+                market_price=self.provider.tick.price
+            ))
+            return tx_hash
+
+        algorithm.submit_trade = recording_submit_trade
+        self.provider.on_broadcast = lambda tx_hash: asyncio.get_running_loop().create_task(
+            algorithm.receipt_tracker.check_pending()
+        )
+
+    async def run(self) -> ReplayReport:
+        """Replay every tick and report throughput and trades"""
+        algorithm = self.algorithm
+        latencies = []
+        started = time.perf_counter()
+        for tick in self.ticks:
+            self.clock.set(tick.timestamp)
+            self.provider.tick = tick
+            await algorithm.gas_oracle.refresh()
+
+            tick_started = time.perf_counter()
+            await algorithm.handle_price_update({
+                'type': 'PRICE_UPDATE',
+                'price': str(int(tick.price * Decimal(1e8)))
+            })
+            latencies.append(time.perf_counter() - tick_started)
+            # Simulated time has no gap between ticks for a trade to overlap
+            if algorithm.trade_task is not None:
+                await algorithm.trade_task
+
+        return ReplayReport(
+            ticks=len(self.ticks),
+            wall_seconds=time.perf_counter() - started,
+            simulated_seconds=(self.ticks[-1].timestamp - self.ticks[0].timestamp) if self.ticks else 0.0,
+            trades=self.trades,
+            tick_latencies=latencies
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay recorded ticks through the trading pipeline')
+    parser.add_argument('ticks', help='CSV or JSON lines tick file')
+    parser.add_argument('--balance', type=Decimal, default=Decimal('1e9'),
+                        help='starting token balance available for burns')
+    parser.add_argument('--trades-out', help='write the simulated trades as JSON lines')
+    parser.add_argument('--verbose', action='store_true', help='keep per-tick logging')
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+        structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    engine = ReplayEngine(load_ticks(args.ticks), balance=args.balance)
+    report = asyncio.run(engine.run())
+
+    print(f"Replayed {report.ticks} ticks covering {report.simulated_seconds / 3600:.1f}h "
+          f"in {report.wall_seconds:.2f}s ({report.ticks_per_second:,.0f} ticks/sec)")
+    print(f"Tick latency p50 {report.latency_percentile(0.5):.3f}ms "
+          f"p99 {report.latency_percentile(0.99):.3f}ms")
+    print(f"Trades: {len(report.trades)} "
+          f"({sum(t.is_mint for t in report.trades)} mint, "
+          f"{sum(not t.is_mint for t in report.trades)} burn)")
+
+    if args.trades_out:
+        with open(args.trades_out, 'wb') as f:
+            for trade in report.trades:
+                f.write(orjson.dumps(asdict(trade), default=str) + b'\n')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,227 @@
+import os
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, List, Optional
+import aiohttp
+from tatum_utils import AsyncTatumProvider, is_nonce_error, is_already_known, transaction_hash
+from monitoring import RPC_ENDPOINT_LATENCY, RPC_ENDPOINT_ERROR_RATE, RPC_HEDGED_REQUESTS, RPC_HEDGE_WINS
+
+logger = logging.getLogger(__name__)
+
+def is_endpoint_fault(error: Exception) -> bool:
+    """Whether a failure says something about the endpoint rather than the request.
+
+    Only transport errors, timeouts, rate limiting (429) and server errors
+    (5xx) count; anything else, such as a node rejecting a transaction or
+    a JSON-RPC error, would be the same on every endpoint.
+    """
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status >= 500 or error.status == 429
+    return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError, OSError))
+
+class Endpoint:
+    """One Tatum endpoint with smoothed latency and error rate"""
+
+    def __init__(self, provider: AsyncTatumProvider, alpha: float = 0.2,
+                 max_error_rate: float = 0.5, cooldown: float = 5.0):
+        self.provider = provider
+        self.name = provider.base_url
+        self.alpha = alpha
+        self.max_error_rate = max_error_rate
+        self.cooldown = cooldown
+        self.latency: Optional[float] = None  # EWMA seconds
+        self.error_rate = 0.0  # EWMA of failed requests
+        self.latencies: deque = deque(maxlen=200)
+        self.unhealthy_until = 0.0
+        self._latency_gauge = RPC_ENDPOINT_LATENCY.labels(endpoint=self.name)
+        self._error_gauge = RPC_ENDPOINT_ERROR_RATE.labels(endpoint=self.name)
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.unhealthy_until
+
+    def record_success(self, latency: Optional[float] = None):
+        """Count a success; only read latencies feed the ranking and the hedge delay"""
+        if latency is not None:
+            self.latencies.append(latency)
+            self.latency = latency if self.latency is None else (
+                self.alpha * latency + (1 - self.alpha) * self.latency
+            )
+            self._latency_gauge.set(self.latency)
+        self.error_rate *= 1 - self.alpha
+        self._error_gauge.set(self.error_rate)
+
+    def record_failure(self):
+        self.error_rate = self.alpha + (1 - self.alpha) * self.error_rate
+        self._error_gauge.set(self.error_rate)
+        if self.error_rate > self.max_error_rate:
+            # Taken out of rotation, then tried again once the cooldown passes
+            self.unhealthy_until = time.monotonic() + self.cooldown
+
+    def latency_quantile(self, q: float) -> Optional[float]:
+        if len(self.latencies) < 20:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+class RpcPool:
+    """Routes Tatum requests over several endpoints to cut tail latency.
+
+    Each endpoint keeps EWMAs of its latency and error rate. Requests go to
+    the fastest healthy endpoint. An idempotent read that has not answered
+    within that endpoint's p95 latency is hedged to the next endpoint, and
+    the first answer wins; failures fail over the same way. Broadcasts go
+    to every endpoint at once, and count as accepted if any endpoint takes
+    the transaction or reports it as already known. Exposes the
+    AsyncTatumProvider interface.
+    """
+
+    def __init__(self, base_urls: List[str],
+                 hedge_quantile: float = 0.95,
+                 default_hedge_delay: float = 0.1,
+                 min_hedge_delay: float = 0.005,
+                 **provider_kwargs):
+        if not base_urls:
+            raise ValueError("RpcPool needs at least one endpoint")
+        # The pool fails over and hedges itself; retrying one endpoint first
+        # would only hide its faults and delay the failover
+        provider_kwargs.setdefault('max_tries', 1)
+        self.endpoints = [
+            Endpoint(AsyncTatumProvider(base_url=url, **provider_kwargs))
+            for url in base_urls
+        ]
+        self.hedge_quantile = hedge_quantile
+        self.default_hedge_delay = default_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+
+    @classmethod
+    def from_env(cls, **kwargs) -> 'RpcPool':
+        """Pool over the comma-separated TATUM_BASE_URLS"""
+        return cls(
+            [url.strip() for url in os.getenv('TATUM_BASE_URLS', '').split(',') if url.strip()],
+            **kwargs
+        )
+
+    async def __aenter__(self) -> 'RpcPool':
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        await asyncio.gather(*(endpoint.provider.close() for endpoint in self.endpoints))
+
+    def ranked(self) -> List[Endpoint]:
+        """Healthy endpoints fastest first, then the rest; unmeasured ones count as fastest"""
+        return sorted(
+            self.endpoints,
+            key=lambda endpoint: (not endpoint.healthy, endpoint.latency or 0.0)
+        )
+
+    def hedge_delay(self, endpoint: Endpoint) -> float:
+        latency = endpoint.latency_quantile(self.hedge_quantile)
+        if latency is None:
+            return self.default_hedge_delay
+        return max(latency, self.min_hedge_delay)
+
+    async def _timed(self, endpoint: Endpoint, call: Callable[[AsyncTatumProvider], Awaitable],
+                     read: bool = True):
+        started = time.perf_counter()
+        try:
+            result = await call(endpoint.provider)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if is_endpoint_fault(e):
+                endpoint.record_failure()
+            raise
+        # A broadcast waits on mempool admission, so its time says little
+        # about how fast the endpoint answers reads
+        endpoint.record_success(time.perf_counter() - started if read else None)
+        return result
+
+    async def hedged(self, call: Callable[[AsyncTatumProvider], Awaitable]) -> Any:
+        """Run an idempotent read, hedging to the next endpoint when the current one is slow or fails"""
+        candidates = self.ranked()
+        running = set()
+        primary = None
+        errors = []
+        try:
+            while candidates or running:
+                timeout = None
+                if candidates:
+                    endpoint = candidates.pop(0)
+                    task = asyncio.ensure_future(self._timed(endpoint, call))
+                    if primary is None:
+                        primary = task
+                    else:
+                        RPC_HEDGED_REQUESTS.inc()
+                    running.add(task)
+                    if candidates:
+                        timeout = self.hedge_delay(endpoint)
+                done, running = await asyncio.wait(
+                    running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        if task is not primary:
+                            RPC_HEDGE_WINS.inc()
+                        return task.result()
+                    if not is_endpoint_fault(error):
+                        # The request itself is bad; another endpoint would say the same
+                        raise error
+                    # Fail over at once rather than waiting out the hedge delay
+                    errors.append(error)
+            raise errors[0]
+        finally:
+            for task in running:
+                task.cancel()
+
+    async def broadcast_signed_transaction(self, signed_tx: str) -> str:
+        """Broadcast to every endpoint in parallel, returning the first accepted hash"""
+        results = await asyncio.gather(*(
+            self._timed(endpoint, lambda provider: provider.broadcast_signed_transaction(signed_tx),
+                        read=False)
+            for endpoint in self.endpoints
+        ), return_exceptions=True)
+        for result in results:
+            if not isinstance(result, BaseException):
+                return result
+        if any(is_already_known(e) for e in results):
+            # The node has this exact transaction, so it was accepted
+            return transaction_hash(signed_tx)
+        # Prefer what a node said about the transaction over endpoint faults,
+        # and a nonce error above all so the caller resyncs
+        rejections = [e for e in results if not is_endpoint_fault(e)]
+        nonce_errors = [e for e in rejections if is_nonce_error(e)]
+        raise (nonce_errors or rejections or results)[0]
+
+    async def get_gas_price(self) -> int:
+        return await self.hedged(lambda provider: provider.get_gas_price())
+
+    async def get_nonce(self, address: str) -> int:
+        return await self.hedged(lambda provider: provider.get_nonce(address))
+
+    async def get_pending_nonce(self, address: str) -> int:
+        return await self.hedged(lambda provider: provider.get_pending_nonce(address))
+
+    async def get_transaction_receipt(self, tx_hash: str) -> Optional[dict]:
+        return await self.hedged(lambda provider: provider.get_transaction_receipt(tx_hash))
+
+    async def rpc_batch(self, calls: list[tuple[str, list]]) -> list:
+        return await self.hedged(lambda provider: provider.rpc_batch(calls))
+
+    async def get_transaction_receipts(self, tx_hashes: list[str]) -> list[Optional[dict]]:
+        return await self.hedged(lambda provider: provider.get_transaction_receipts(tx_hashes))
+
+    async def batch_call(self, calls: list[tuple[str, str]], block: str = 'latest') -> list[str]:
+        return await self.hedged(lambda provider: provider.batch_call(calls, block))
+
+    async def estimate_gas(self, from_address: str, to_address: str, data: str) -> int:
+        return await self.hedged(lambda provider: provider.estimate_gas(from_address, to_address, data))
+
+    async def get_token_balance(self, address: str, token_address: str) -> int:
+        return await self.hedged(lambda provider: provider.get_token_balance(address, token_address))
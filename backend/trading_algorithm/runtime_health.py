@@ -0,0 +1,83 @@
+import time
+import asyncio
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+from monitoring import (
+    EVENT_LOOP_LAG,
+    TASKS_PENDING,
+    EXECUTOR_QUEUE_DEPTH,
+    EXECUTOR_BUSY_WORKERS,
+    EXECUTOR_MAX_WORKERS,
+    EXECUTOR_QUEUE_WAIT,
+)
+
+logger = logging.getLogger(__name__)
+
+class InstrumentedThreadPoolExecutor(ThreadPoolExecutor):
+    """Thread pool that exports its queue depth, busy workers and queue wait"""
+
+    def __init__(self, max_workers: Optional[int] = None, name: str = 'default'):
+        super().__init__(max_workers=max_workers, thread_name_prefix=f"{name}-executor")
+        self.name = name
+        self._queue_depth = EXECUTOR_QUEUE_DEPTH.labels(executor=name)
+        self._busy = EXECUTOR_BUSY_WORKERS.labels(executor=name)
+        self._queue_wait = EXECUTOR_QUEUE_WAIT.labels(executor=name)
+        EXECUTOR_MAX_WORKERS.labels(executor=name).set(self._max_workers)
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        submitted_at = time.perf_counter()
+
+        def run():
+            self._queue_depth.dec()
+            self._queue_wait.observe(time.perf_counter() - submitted_at)
+            self._busy.inc()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._busy.dec()
+
+        self._queue_depth.inc()
+        try:
+            future = super().submit(run)
+        except Exception:
+            self._queue_depth.dec()
+            raise
+        # Work cancelled before it started never reaches run()
+        future.add_done_callback(lambda f: f.cancelled() and self._queue_depth.dec())
+        return future
+
+class RuntimeHealth:
+    """Exports event loop lag, pending tasks and default executor saturation.
+
+    `install` replaces the loop's default executor, which backs
+    asyncio.to_thread and run_in_executor(None, ...), with an instrumented
+    one. `run` wakes every `interval` seconds and records how late the
+    wakeup was as loop lag, plus the number of unfinished tasks.
+    """
+
+    def __init__(self, interval: float = 0.5, max_workers: Optional[int] = None):
+        self.interval = interval
+        self.max_workers = max_workers
+        self.executor: Optional[InstrumentedThreadPoolExecutor] = None
+        self.last_lag = 0.0
+
+    def install(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """Route the default executor through an instrumented thread pool"""
+        loop = loop or asyncio.get_running_loop()
+        if self.executor is None:
+            self.executor = InstrumentedThreadPoolExecutor(self.max_workers, name='default')
+            loop.set_default_executor(self.executor)
+
+    async def run(self):
+        """Sample loop lag and task count until cancelled"""
+        loop = asyncio.get_running_loop()
+        self.install(loop)
+        while True:
+            scheduled = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.last_lag = max(0.0, loop.time() - scheduled)
+            EVENT_LOOP_LAG.observe(self.last_lag)
+            TASKS_PENDING.set(len(asyncio.all_tasks(loop)))
+            if self.last_lag > 1.0:
+                logger.warning(f"Event loop stalled for {self.last_lag:.2f}s")
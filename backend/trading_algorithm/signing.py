@@ -0,0 +1,69 @@
+import math
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import List, Optional
+from eth_account import Account
+from eth_account.datastructures import SignedTransaction
+from eth_account.signers.local import LocalAccount
+from runtime_health import InstrumentedThreadPoolExecutor
+
+# Account of a signing worker process, derived once when the worker starts
+_worker_account: Optional[LocalAccount] = None
+
+def _init_worker(private_key: str):
+    global _worker_account
+    _worker_account = Account.from_key(private_key)
+
+def _sign_in_worker(transactions: List[dict]) -> List[SignedTransaction]:
+    return [_worker_account.sign_transaction(tx) for tx in transactions]
+
+class SigningService:
+    """Signs transactions with a pre-derived account on a dedicated executor.
+
+    The private key is parsed into a LocalAccount once rather than for every
+    transaction, and ECDSA signing runs on its own small pool so it never
+    queues behind blocking I/O on the default executor. With
+    `use_processes` the pool is process based, each worker deriving the
+    account once at startup, so signing also stays off the GIL.
+    """
+
+    def __init__(self, private_key: str, max_workers: int = 2, use_processes: bool = False):
+        self.account: LocalAccount = Account.from_key(private_key)
+        self.address = self.account.address
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+        if use_processes:
+            # Spawn, not fork: the parent has a running event loop and threads
+            self.executor: Executor = ProcessPoolExecutor(
+                max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(private_key,)
+            )
+        else:
+            self.executor = InstrumentedThreadPoolExecutor(max_workers, name='signing')
+
+    def _sign_in_thread(self, transactions: List[dict]) -> List[SignedTransaction]:
+        return [self.account.sign_transaction(tx) for tx in transactions]
+
+    async def sign(self, transaction: dict) -> SignedTransaction:
+        """Sign one transaction"""
+        return (await self.sign_many([transaction]))[0]
+
+    async def sign_many(self, transactions: List[dict]) -> List[SignedTransaction]:
+        """Sign a batch spread over the workers in order-preserving chunks"""
+        if not transactions:
+            return []
+        loop = asyncio.get_running_loop()
+        sign = _sign_in_worker if self.use_processes else self._sign_in_thread
+        chunk_size = math.ceil(len(transactions) / min(self.max_workers, len(transactions)))
+        chunks = await asyncio.gather(*(
+            loop.run_in_executor(self.executor, sign, transactions[i:i + chunk_size])
+            for i in range(0, len(transactions), chunk_size)
+        ))
+        return [signed for chunk in chunks for signed in chunk]
+
+    def close(self):
+        """Stop the signing workers"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
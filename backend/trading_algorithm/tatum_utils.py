@@ -1,28 +1,104 @@
 import os
-import json
+import time
 import asyncio
-import websockets
+import aiohttp
 from web3 import Web3
-from typing import Optional, Callable, Dict, Any
+from typing import Optional, Callable, Dict, Any, List
 import requests
 from dotenv import load_dotenv
 import backoff
 from datetime import datetime, timedelta
+from event_dispatcher import EventDispatcher, LATEST, FIFO
+from ws_manager import WebSocketManager
 
 load_dotenv()
 
+NONCE_ERRORS = (
+    'nonce too low',
+    'nonce is too low',
+    'replacement transaction underpriced',
+)
+
+# The node already has this exact signed transaction, e.g. from a retried broadcast
+ALREADY_KNOWN_ERRORS = (
+    'already known',
+    'known transaction',
+)
+
+# Hex-encoded quantities in JSON-RPC receipts
+RECEIPT_QUANTITY_FIELDS = (
+    'blockNumber',
+    'cumulativeGasUsed',
+    'effectiveGasPrice',
+    'gasUsed',
+    'status',
+    'transactionIndex',
+)
+
+class JsonRpcError(Exception):
+    """Error object returned by a JSON-RPC call, e.g. a reverted eth_call; the same on every retry"""
+
+    def __init__(self, error: dict):
+        super().__init__(f"JSON-RPC error: {error}")
+        self.code = error.get('code') if isinstance(error, dict) else None
+
+def is_nonce_error(error: Exception) -> bool:
+    """Whether a broadcast failed because the nonce was already used"""
+    message = str(error).lower()
+    return any(pattern in message for pattern in NONCE_ERRORS)
+
+def is_already_known(error: Exception) -> bool:
+    """Whether a broadcast was rejected only because the node already has the transaction"""
+    message = str(error).lower()
+    return any(pattern in message for pattern in ALREADY_KNOWN_ERRORS)
+
+def is_client_error(error: Exception) -> bool:
+    """Whether the API refused the request itself (4xx other than 429), so a retry gets the same answer"""
+    return (isinstance(error, aiohttp.ClientResponseError)
+            and 400 <= error.status < 500 and error.status != 429)
+
+def to_int(quantity) -> int:
+    """A quantity as an int, whether hex-encoded as in JSON-RPC, a decimal string or a number"""
+    if isinstance(quantity, str) and quantity[:2].lower() == '0x':
+        return int(quantity, 16)
+    return int(quantity)
+
+def transaction_hash(signed_tx: str) -> str:
+    """Hash of a signed raw transaction, as the network will report it"""
+    return Web3.keccak(hexstr=signed_tx).hex()
+
+DEFAULT_BASE_URL = "https://api.tatum.io/v3"
+DEFAULT_WS_URL = "wss://ws.tatum.io/v3/polygon"
+
 class TatumProvider:
-    def __init__(self):
+    def __init__(self, base_url: Optional[str] = None, ws_url: Optional[str] = None,
+                 ws_urls: Optional[List[str]] = None):
         self.api_key = os.getenv('TATUM_API_KEY')
-        self.base_url = "https://api.tatum.io/v3"
-        self.ws_url = "wss://ws.tatum.io/v3/polygon"
+        # Overridable to point at a regional endpoint or a local stand-in
+        self.base_url = base_url or os.getenv('TATUM_BASE_URL', DEFAULT_BASE_URL)
+        self.ws_url = ws_url or os.getenv('TATUM_WS_URL', DEFAULT_WS_URL)
+        # Standby connections and reconnects rotate over these
+        self.ws_urls = ws_urls or [
+            url.strip() for url in os.getenv('TATUM_WS_URLS', '').split(',') if url.strip()
+        ] or [self.ws_url]
         self.headers = {
             'x-api-key': self.api_key,
             'Content-Type': 'application/json'
         }
         self.rate_limits: Dict[str, datetime] = {}
-        self.websocket = None
-        self.subscribers: Dict[str, list[Callable]] = {}
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        # Act on the newest price only, but see every block in order
+        self.dispatcher = EventDispatcher(policies={
+            'PRICE_UPDATE': LATEST,
+            'BLOCK_MINED': FIFO
+        })
+        self.subscribers = self.dispatcher.subscribers
+        self.connection = WebSocketManager(
+            [f"{url}?apiKey={self.api_key}" for url in self.ws_urls],
+            self.dispatcher,
+            standby=int(os.getenv('WS_STANDBY_CONNECTIONS', '0'))
+        )
 
     @backoff.on_exception(backoff.expo, 
                          (requests.exceptions.RequestException, ValueError),
@@ -34,11 +110,11 @@ class TatumProvider:
         if endpoint in self.rate_limits:
             time_passed = now - self.rate_limits[endpoint]
             if time_passed < timedelta(milliseconds=200):  # 5 requests per second
-                asyncio.sleep(0.2 - time_passed.total_seconds())
+                time.sleep(0.2 - time_passed.total_seconds())
         
         url = f"{self.base_url}/{endpoint}"
-        response = requests.request(method, url, headers=self.headers, **kwargs)
-        self.rate_limits[endpoint] = now
+        self.rate_limits[endpoint] = datetime.now()
+        response = self.session.request(method, url, **kwargs)
         
         response.raise_for_status()
         return response.json()
@@ -88,45 +164,16 @@ class TatumProvider:
         return int(response['gasLimit'])
 
     async def subscribe_to_events(self, event_types: list[str], callback: Callable):
-        """Subscribe to WebSocket events"""
-        if not self.websocket:
-            self.websocket = await websockets.connect(
-                f"{self.ws_url}?apiKey={self.api_key}"
-            )
-        
+        """Subscribe to WebSocket events, resubscribing after every reconnect"""
         for event_type in event_types:
-            if event_type not in self.subscribers:
-                self.subscribers[event_type] = []
-            self.subscribers[event_type].append(callback)
-            
-            await self.websocket.send(json.dumps({
-                "type": "SUBSCRIBE",
-                "event": event_type
-            }))
+            self.dispatcher.subscribe(event_type, callback)
+            await self.connection.subscribe(event_type)
+        self.dispatcher.start()
 
     async def start_websocket_listener(self):
         """Start WebSocket listener"""
-        while True:
-            try:
-                if not self.websocket:
-                    self.websocket = await websockets.connect(
-                        f"{self.ws_url}?apiKey={self.api_key}"
-                    )
-
-                async for message in self.websocket:
-                    data = json.loads(message)
-                    event_type = data.get('type')
-                    
-                    if event_type in self.subscribers:
-                        for callback in self.subscribers[event_type]:
-                            await callback(data)
-
-            except websockets.exceptions.ConnectionClosed:
-                self.websocket = None
-                await asyncio.sleep(5)  # Wait before reconnecting
-            except Exception as e:
-                print(f"WebSocket error: {e}")
-                await asyncio.sleep(5)
+        self.dispatcher.start()
+        await self.connection.run()
 
     def monitor_address(self, address: str, webhook_url: str):
         """Set up address monitoring"""
@@ -156,4 +203,209 @@ class TatumProvider:
 
     def get_block_by_hash(self, block_hash: str) -> dict:
         """Get block information by hash"""
-        return self._make_request('GET', f'polygon/block/{block_hash}') 
\ No newline at end of file
+        return self._make_request('GET', f'polygon/block/{block_hash}') 
+
+
+class TokenBucket:
+    """Async token bucket that makes callers wait for capacity"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self):
+        """Take one token, sleeping until one is available"""
+        async with self._lock:
+            self._refill()
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+
+class AsyncTatumProvider:
+    """Non-blocking Tatum REST client on a pooled keep-alive aiohttp session.
+
+    Failed requests are retried with exponential backoff up to `max_tries`
+    attempts in total; pass 1 when something else, such as an RpcPool,
+    handles failover. A 4xx other than 429, such as a missing receipt or a
+    rejected broadcast, is raised at once.
+    """
+
+    def __init__(self, requests_per_second: float = 5.0, pool_size: int = 20,
+                 base_url: Optional[str] = None, max_tries: int = 5):
+        self.api_key = os.getenv('TATUM_API_KEY')
+        self.base_url = base_url or os.getenv('TATUM_BASE_URL', DEFAULT_BASE_URL)
+        self.headers = {
+            'x-api-key': self.api_key,
+            'Content-Type': 'application/json'
+        }
+        self.requests_per_second = requests_per_second
+        self.pool_size = pool_size
+        self.max_tries = max_tries
+        self._make_request = backoff.on_exception(
+            backoff.expo,
+            (aiohttp.ClientError, asyncio.TimeoutError, ValueError),
+            max_tries=max_tries,
+            giveup=lambda e: is_client_error(e) or is_nonce_error(e) or is_already_known(e)
+        )(self._request_once)
+        self.rate_limits: Dict[str, TokenBucket] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> 'AsyncTatumProvider':
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                keepalive_timeout=60,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._session
+
+    async def close(self):
+        """Close the pooled session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _acquire(self, rate_key: str):
+        """Wait for the rate limit of an endpoint"""
+        bucket = self.rate_limits.get(rate_key)
+        if bucket is None:
+            bucket = self.rate_limits[rate_key] = TokenBucket(self.requests_per_second)
+        await bucket.acquire()
+
+    async def _request_once(self, method: str, endpoint: str,
+                            rate_key: Optional[str] = None, **kwargs) -> Any:
+        """Make HTTP request with per-endpoint rate limiting; _make_request adds the retries"""
+        await self._acquire(rate_key or endpoint)
+
+        url = f"{self.base_url}/{endpoint}"
+        async with self._get_session().request(method, url, **kwargs) as response:
+            if response.status >= 400:
+                # Keep the response body, it carries node errors such as "nonce too low"
+                raise aiohttp.ClientResponseError(
+                    response.request_info,
+                    response.history,
+                    status=response.status,
+                    message=await response.text() or response.reason,
+                    headers=response.headers
+                )
+            return await response.json()
+
+    async def get_gas_price(self) -> int:
+        """Get current gas price from Tatum"""
+        data = await self._make_request('GET', 'polygon/gas')
+        return int(data['gasPrice'])
+
+    async def get_nonce(self, address: str) -> int:
+        """Get next nonce for address"""
+        data = await self._make_request('GET', f'polygon/nonce/{address}',
+                                        rate_key='polygon/nonce')
+        return int(data['nonce'])
+
+    async def get_pending_nonce(self, address: str) -> int:
+        """Next nonce for address counting transactions still in the node's mempool"""
+        count, = await self.rpc_batch([('eth_getTransactionCount', [address, 'pending'])])
+        return int(count, 16)
+
+    async def broadcast_signed_transaction(self, signed_tx: str) -> str:
+        """Broadcast signed transaction using Tatum"""
+        try:
+            data = await self._make_request('POST', 'polygon/broadcast',
+                                            json={'txData': signed_tx})
+        except aiohttp.ClientResponseError as e:
+            if is_already_known(e):
+                # An earlier attempt that timed out on our side reached the node
+                return transaction_hash(signed_tx)
+            raise
+        return data['txId']
+
+    async def get_transaction_receipt(self, tx_hash: str) -> Optional[dict]:
+        """Get transaction receipt"""
+        try:
+            return await self._make_request('GET', f'polygon/transaction/{tx_hash}',
+                                            rate_key='polygon/transaction')
+        except aiohttp.ClientResponseError as e:
+            if e.status == 404:
+                return None
+            raise
+
+    async def rpc_batch(self, calls: list[tuple[str, list]]) -> list:
+        """Send several JSON-RPC calls to the web3 endpoint in one request.
+
+        Transport failures are retried by _make_request. An error object in
+        the response, such as a reverted eth_call, raises JsonRpcError at
+        once, since every retry would get the same answer.
+        """
+        if not calls:
+            return []
+        payload = [
+            {'jsonrpc': '2.0', 'id': i, 'method': method, 'params': params}
+            for i, (method, params) in enumerate(calls)
+        ]
+        responses = await self._make_request('POST', f'polygon/web3/{self.api_key}',
+                                             rate_key='polygon/web3', json=payload)
+        if not isinstance(responses, list):
+            raise ValueError(f"Unexpected JSON-RPC batch response: {responses}")
+        results = [None] * len(calls)
+        for response in responses:
+            if 'error' in response:
+                raise JsonRpcError(response['error'])
+            results[response['id']] = response.get('result')
+        return results
+
+    async def get_transaction_receipts(self, tx_hashes: list[str]) -> list[Optional[dict]]:
+        """Get receipts for several transactions in one batch, None if still pending"""
+        receipts = await self.rpc_batch(
+            [('eth_getTransactionReceipt', [tx_hash]) for tx_hash in tx_hashes]
+        )
+        for receipt in receipts:
+            if receipt:
+                for field in RECEIPT_QUANTITY_FIELDS:
+                    if isinstance(receipt.get(field), str):
+                        receipt[field] = int(receipt[field], 16)
+        return receipts
+
+    async def batch_call(self, calls: list[tuple[str, str]],
+                         block: str = 'latest') -> list[str]:
+        """Run several read-only contract calls (to, data) in one batch, returning raw results"""
+        return await self.rpc_batch(
+            [('eth_call', [{'to': to, 'data': data}, block]) for to, data in calls]
+        )
+
+    async def estimate_gas(self, from_address: str, to_address: str, data: str) -> int:
+        """Estimate gas for transaction"""
+        response = await self._make_request('POST', 'polygon/gas/estimate',
+                                            json={
+                                                'from': from_address,
+                                                'to': to_address,
+                                                'data': data
+                                            })
+        return int(response['gasLimit'])
+
+    async def get_token_balance(self, address: str, token_address: str) -> int:
+        """Get token balance for address"""
+        data = await self._make_request('GET',
+                                        f'polygon/account/balance/{token_address}/{address}',
+                                        rate_key='polygon/account/balance')
+        return int(data['balance'])
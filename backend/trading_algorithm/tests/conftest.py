@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Backend modules import each other by name, as when run from their directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+os.environ.setdefault('TATUM_API_KEY', 'test')
@@ -0,0 +1,95 @@
+import asyncio
+from nonce_manager import NonceManager
+
+class FakeProvider:
+    """Pending nonce source that yields to the loop on every lookup"""
+
+    def __init__(self, pending: int = 0):
+        self.pending = pending
+        self.lookups = 0
+
+    async def get_pending_nonce(self, address: str) -> int:
+        self.lookups += 1
+        await asyncio.sleep(0)
+        return self.pending
+
+def test_concurrent_allocations_are_unique_and_sequential():
+    async def run():
+        provider = FakeProvider(pending=7)
+        manager = NonceManager(provider, '0xabc')
+        nonces = await asyncio.gather(*(manager.allocate() for _ in range(20)))
+        return provider, manager, nonces
+
+    provider, manager, nonces = asyncio.run(run())
+    assert sorted(nonces) == list(range(7, 27))
+    assert provider.lookups == 1
+    assert manager.outstanding == set(range(7, 27))
+
+def test_resync_stays_above_outstanding_nonces():
+    async def run():
+        provider = FakeProvider(pending=0)
+        manager = NonceManager(provider, '0xabc')
+        for _ in range(5):
+            await manager.allocate()
+        manager.complete(0)
+        manager.complete(1)
+        # The node has only seen the first two; 2..4 are still in flight
+        provider.pending = 2
+        return await manager.resync(), await manager.allocate()
+
+    assert asyncio.run(run()) == (5, 5)
+
+def test_resync_follows_the_chain_when_it_is_ahead():
+    async def run():
+        provider = FakeProvider(pending=0)
+        manager = NonceManager(provider, '0xabc')
+        nonce = await manager.allocate()
+        manager.complete(nonce)
+        provider.pending = 10  # another sender used our key
+        await manager.resync()
+        return await manager.allocate()
+
+    assert asyncio.run(run()) == 10
+
+def test_resync_reuses_a_dropped_nonce():
+    async def run():
+        provider = FakeProvider(pending=3)
+        manager = NonceManager(provider, '0xabc')
+        nonce = await manager.allocate()
+        # Timed out and no longer pending on the node
+        manager.complete(nonce)
+        return await manager.resync()
+
+    assert asyncio.run(run()) == 3
+
+def test_release_reuses_only_a_tail_of_unbroadcast_nonces():
+    async def run():
+        manager = NonceManager(FakeProvider(pending=0), '0xabc')
+        nonces = [await manager.allocate() for _ in range(4)]
+        manager.release(nonces[1])
+        after_gap = await manager.allocate()
+        manager.release(after_gap)
+        manager.release(nonces[3])
+        manager.release(nonces[2])
+        return after_gap, await manager.allocate(), manager.outstanding
+
+    after_gap, reused, outstanding = asyncio.run(run())
+    # 1 is a gap while 2 and 3 are in use; once they are released too, it is reused
+    assert after_gap == 4
+    assert reused == 1
+    assert outstanding == {0, 1}
+
+def test_allocations_wait_for_a_resync_in_progress():
+    async def run():
+        provider = FakeProvider(pending=0)
+        manager = NonceManager(provider, '0xabc')
+        first = await manager.allocate()
+        manager.complete(first)
+        provider.pending = 5
+        resync = asyncio.ensure_future(manager.resync())
+        await asyncio.sleep(0)  # resync holds the lock and awaits the node
+        nonces = await asyncio.gather(*(manager.allocate() for _ in range(3)))
+        await resync
+        return nonces
+
+    assert asyncio.run(run()) == [5, 6, 7]
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+from quantile_sketch import SlidingQuantileSketch
+
+QS = [0.05, 0.25, 0.5, 0.75, 0.95]
+
+def window_samples(samples, now, window_seconds, pane_seconds):
+    """Samples the sketch should still hold: every pane overlapping the window"""
+    oldest_pane = (now - window_seconds) // pane_seconds
+    return np.array([v for v, t in samples if t // pane_seconds >= oldest_pane])
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_quantiles_track_numpy_across_pane_expiry(seed):
+    rng = np.random.default_rng(seed)
+    sketch = SlidingQuantileSketch(window_seconds=600, pane_seconds=60, relative_accuracy=0.01)
+    # Drifting lognormal values, so expired panes hold a different distribution
+    samples = []
+    for t in np.sort(rng.uniform(0, 3000, 5000)):
+        value = float(rng.lognormal(mean=3 + t / 1000, sigma=0.5))
+        sketch.add(value, t)
+        samples.append((value, t))
+        if len(samples) % 500 == 0:
+            expected = np.quantile(window_samples(samples, t, 600, 60), QS, method='lower')
+            assert sketch.count == len(window_samples(samples, t, 600, 60))
+            assert np.allclose(sketch.quantiles(QS), expected, rtol=0.01)
+
+def test_boundary_pane_is_kept_until_it_leaves_the_window():
+    sketch = SlidingQuantileSketch(window_seconds=600, pane_seconds=60)
+    sketch.add(1.0, 30)  # pane 0 covers [0, 60)
+    sketch.expire(630)   # the window starts at 30, inside pane 0
+    assert sketch.count == 1
+    sketch.expire(660)   # the window starts at 60, after pane 0 ends
+    assert sketch.count == 0
+    assert sketch.quantiles([0.5]) == []
@@ -0,0 +1,64 @@
+import asyncio
+import pytest
+from receipt_tracker import ReceiptTracker, ReceiptTimeout
+
+class FakeProvider:
+    """Receipt source that answers from a dict of mined hashes"""
+
+    def __init__(self):
+        self.mined = {}
+        self.batches = []
+
+    async def get_transaction_receipts(self, tx_hashes):
+        self.batches.append(list(tx_hashes))
+        await asyncio.sleep(0)
+        return [self.mined.get(tx_hash) for tx_hash in tx_hashes]
+
+def test_one_batch_per_block_for_all_pending():
+    async def run():
+        provider = FakeProvider()
+        tracker = ReceiptTracker(provider)
+        waiters = [asyncio.ensure_future(tracker.wait_for(f'0x{i}')) for i in range(10)]
+        await asyncio.sleep(0)
+        provider.mined = {f'0x{i}': {'status': 1, 'n': i} for i in range(0, 10, 2)}
+        await tracker.on_block({})
+        await asyncio.sleep(0.01)
+        done = [w for w in waiters if w.done()]
+        provider.mined = {f'0x{i}': {'status': 1, 'n': i} for i in range(10)}
+        await tracker.on_block({})
+        receipts = await asyncio.gather(*waiters)
+        return provider, tracker, len(done), receipts
+
+    provider, tracker, done_after_first, receipts = asyncio.run(run())
+    assert len(provider.batches) == 2
+    assert len(provider.batches[0]) == 10
+    assert sorted(provider.batches[1]) == sorted(f'0x{i}' for i in range(1, 10, 2))
+    assert done_after_first == 5
+    assert [r['n'] for r in receipts] == list(range(10))
+    assert tracker.pending == {}
+
+def test_no_request_without_pending_transactions():
+    async def run():
+        provider = FakeProvider()
+        await ReceiptTracker(provider).on_block({})
+        return provider
+
+    assert asyncio.run(run()).batches == []
+
+def test_deadline_raises_and_stops_tracking():
+    async def run():
+        tracker = ReceiptTracker(FakeProvider(), timeout=0.01)
+        with pytest.raises(ReceiptTimeout):
+            await tracker.wait_for('0xdead')
+        return tracker
+
+    assert asyncio.run(run()).pending == {}
+
+def test_untrack_cancels_the_waiter():
+    async def run():
+        tracker = ReceiptTracker(FakeProvider())
+        future = tracker.track('0xold')
+        tracker.untrack('0xold')
+        return future
+
+    assert asyncio.run(run()).cancelled()
@@ -0,0 +1,99 @@
+import time
+import asyncio
+import aiohttp
+import pytest
+from eth_account import Account
+from rpc_pool import RpcPool
+from tatum_standin import TatumStandIn
+
+def run_pool(settings, body, **pool_kwargs):
+    """Run body(pool, servers) against one stand-in per settings dict, with nothing mined"""
+    async def run():
+        servers = [TatumStandIn(block_time=3600, seed=i, **kwargs) for i, kwargs in enumerate(settings)]
+        for server in servers:
+            await server.start()
+        try:
+            async with RpcPool([server.base_url for server in servers],
+                               requests_per_second=1e6, **pool_kwargs) as pool:
+                return await body(pool, servers)
+        finally:
+            for server in servers:
+                await server.stop()
+    return asyncio.run(run())
+
+def signed_transaction(account, nonce: int = 0, gas_price: int = 50 * 10 ** 9) -> str:
+    return account.sign_transaction({
+        'to': account.address, 'value': 0, 'gas': 21000,
+        'gasPrice': gas_price, 'nonce': nonce, 'chainId': 137
+    }).rawTransaction.hex()
+
+def test_slow_read_is_hedged_to_the_next_endpoint():
+    async def body(pool, servers):
+        started = time.perf_counter()
+        gas_price = await pool.get_gas_price()
+        return gas_price, time.perf_counter() - started
+
+    # Unmeasured endpoints rank in order, so the slow one is tried first
+    gas_price, elapsed = run_pool([{'latency': 1.0}, {}], body, default_hedge_delay=0.05)
+    assert gas_price == 50 * 10 ** 9
+    assert elapsed < 0.5
+
+def test_failing_endpoint_fails_over_and_leaves_rotation():
+    async def body(pool, servers):
+        prices = [await pool.get_gas_price() for _ in range(5)]
+        return prices, pool.endpoints[0], pool.ranked()[0]
+
+    prices, failing, first = run_pool([{'error_rate': 1.0}, {}], body, default_hedge_delay=1.0)
+    assert prices == [50 * 10 ** 9] * 5
+    assert failing.error_rate > failing.max_error_rate
+    assert not failing.healthy
+    assert first is not failing
+
+def test_read_fails_once_every_endpoint_is_down():
+    async def body(pool, servers):
+        with pytest.raises(aiohttp.ClientResponseError) as error:
+            await pool.get_gas_price()
+        return error.value.status, [server.stats['requests'] for server in servers]
+
+    status, requests = run_pool([{'error_rate': 1.0}, {'error_rate': 1.0}], body)
+    assert status == 503
+    # No retries on a single endpoint; the pool fails over instead
+    assert requests == [1, 1]
+
+def test_rebroadcast_is_accepted_without_counting_faults():
+    async def body(pool, servers):
+        tx = signed_transaction(Account.create())
+        first = await pool.broadcast_signed_transaction(tx)
+        again = await pool.broadcast_signed_transaction(tx)
+        return first, again, [endpoint.error_rate for endpoint in pool.endpoints]
+
+    first, again, error_rates = run_pool([{}, {}], body)
+    assert first == again
+    assert error_rates == [0.0, 0.0]
+
+def test_nonce_rejection_is_raised_without_counting_faults():
+    async def body(pool, servers):
+        account = Account.create()
+        await pool.broadcast_signed_transaction(signed_transaction(account))
+        # Same nonce at the same price: not a valid replacement anywhere
+        with pytest.raises(aiohttp.ClientResponseError) as error:
+            await pool.broadcast_signed_transaction(signed_transaction(account, gas_price=50 * 10 ** 9 + 1))
+        return error.value, [endpoint.error_rate for endpoint in pool.endpoints]
+
+    error, error_rates = run_pool([{}, {'error_rate': 1.0}], body)
+    # The node's verdict wins over the other endpoint's 503
+    assert 'replacement transaction underpriced' in error.message
+    assert error_rates[0] == 0.0
+
+def test_broadcast_timings_stay_out_of_the_hedge_delay():
+    async def body(pool, servers):
+        await pool.get_gas_price()
+        account = Account.create()
+        for nonce in range(3):
+            await pool.broadcast_signed_transaction(signed_transaction(account, nonce))
+        return [(len(endpoint.latencies), endpoint.error_rate) for endpoint in pool.endpoints]
+
+    samples = run_pool([{}, {}], body)
+    # Only the read's endpoint measured anything
+    assert sorted(count for count, _ in samples) == [0, 1]
+    assert all(error_rate == 0.0 for _, error_rate in samples)
@@ -0,0 +1,57 @@
+import time
+import asyncio
+import aiohttp
+import pytest
+from eth_account import Account
+from tatum_utils import AsyncTatumProvider
+from tatum_standin import TatumStandIn
+
+def run_provider(body, max_tries=5, **standin_kwargs):
+    """Run body(provider, server) against a retrying provider on one stand-in, with nothing mined"""
+    async def run():
+        server = TatumStandIn(block_time=3600, **standin_kwargs)
+        await server.start()
+        try:
+            async with AsyncTatumProvider(requests_per_second=1e6, base_url=server.base_url,
+                                          max_tries=max_tries) as provider:
+                return await body(provider, server)
+        finally:
+            await server.stop()
+    return asyncio.run(run())
+
+def test_missing_receipt_is_none_without_retries():
+    async def body(provider, server):
+        started = time.perf_counter()
+        receipt = await provider.get_transaction_receipt('0x' + '00' * 32)
+        return receipt, time.perf_counter() - started, server.stats['requests']
+
+    receipt, elapsed, requests = run_provider(body)
+    assert receipt is None
+    assert requests == 1
+    assert elapsed < 0.5
+
+def test_rejected_broadcast_is_raised_without_retries():
+    async def body(provider, server):
+        account = Account.create()
+        await provider.broadcast_signed_transaction(account.sign_transaction({
+            'to': account.address, 'value': 0, 'gas': 21000,
+            'gasPrice': 50 * 10 ** 9, 'nonce': 0, 'chainId': 137
+        }).rawTransaction.hex())
+        with pytest.raises(aiohttp.ClientResponseError) as error:
+            await provider.broadcast_signed_transaction(account.sign_transaction({
+                'to': account.address, 'value': 0, 'gas': 21000,
+                'gasPrice': 50 * 10 ** 9 + 1, 'nonce': 0, 'chainId': 137
+            }).rawTransaction.hex())
+        return error.value.status, server.stats['requests']
+
+    status, requests = run_provider(body)
+    assert status == 400
+    assert requests == 2
+
+def test_server_errors_are_retried():
+    async def body(provider, server):
+        with pytest.raises(aiohttp.ClientResponseError):
+            await provider.get_gas_price()
+        return server.stats['requests']
+
+    assert run_provider(body, max_tries=2, error_rate=1.0) == 2
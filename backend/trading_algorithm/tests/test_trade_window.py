@@ -0,0 +1,50 @@
+import time
+import asyncio
+from decimal import Decimal
+from datetime import datetime, timedelta
+import pytest
+from trade_window_reference import build_optimizer, legacy_find_window, same_window
+
+SIZE = Decimal('5000')
+
+def candidate_minutes(optimizer, now):
+    """Local minute of day of every gas sample in the last hour"""
+    cutoff = (now - timedelta(hours=1)).timestamp()
+    return sorted({
+        datetime.fromtimestamp(t).hour * 60 + datetime.fromtimestamp(t).minute
+        for t in optimizer.gas_history.timestamps() if t >= cutoff
+    })
+
+def assert_matches_legacy(optimizer, now):
+    # Every sample minute as the time range, so candidates land exactly on the bound
+    ranges = [timedelta(minutes=m) for m in candidate_minutes(optimizer, now)]
+    ranges += [timedelta(0), timedelta(days=1)]
+    loop = asyncio.new_event_loop()
+    try:
+        for time_range in ranges:
+            vectorized = loop.run_until_complete(
+                optimizer.find_optimal_trade_window(SIZE, time_range, now=now)
+            )
+            legacy = legacy_find_window(optimizer, SIZE, time_range, now=now)
+            assert same_window(vectorized, legacy), (time_range, vectorized, legacy)
+    finally:
+        loop.close()
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_vectorized_window_matches_legacy_loop(seed):
+    now = datetime(2026, 6, 1, 0, 40)
+    assert_matches_legacy(build_optimizer(2000, seed, now=now), now)
+
+@pytest.fixture
+def dst_timezone(monkeypatch):
+    monkeypatch.setenv('TZ', 'America/New_York')
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+def test_window_uses_each_sample_offset_across_dst(dst_timezone):
+    # Clocks went back from 02:00 EDT to 01:00 EST (06:00 UTC) 20 minutes ago,
+    # so the last hour of samples has two different UTC offsets
+    now = datetime.fromtimestamp(1793512800 + 20 * 60)
+    assert_matches_legacy(build_optimizer(2000, 3, now=now), now)
@@ -0,0 +1,75 @@
+import asyncio
+from decimal import Decimal
+from replay import ReplayEngine, Tick
+
+def trade_engine(splits: int) -> ReplayEngine:
+    """Replay pipeline that trades in equal splits, one unconfirmed at a time, and mines only when told"""
+    engine = ReplayEngine([Tick(1_790_000_000, Decimal('0.98'), Decimal('30'), Decimal('1000000'))])
+    algorithm = engine.algorithm
+    algorithm.max_concurrent_splits = 1
+    engine.provider.on_broadcast = None
+
+    async def optimize_trade_execution(size, max_wait=300, now=None):
+        return [size / splits] * splits, 30 * 10 ** 9, 0
+
+    algorithm.trade_optimizer.optimize_trade_execution = optimize_trade_execution
+    return engine
+
+async def tick(engine: ReplayEngine, timestamp: float, price: str):
+    engine.clock.set(timestamp)
+    engine.provider.tick = Tick(timestamp, Decimal(price), Decimal('30'), Decimal('1000000'))
+    await engine.algorithm.gas_oracle.refresh()
+    await engine.algorithm.handle_price_update({
+        'type': 'PRICE_UPDATE',
+        'price': str(int(Decimal(price) * Decimal(1e8)))
+    })
+
+async def broadcast(engine: ReplayEngine, count: int):
+    """Let the trade run until `count` splits are broadcast; signing runs on an executor"""
+    for _ in range(500):
+        if len(engine.trades) >= count:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"{len(engine.trades)} of {count} splits broadcast")
+
+def test_price_tick_mid_trade_stops_the_remaining_splits():
+    async def run():
+        engine = trade_engine(splits=3)
+        algorithm = engine.algorithm
+        await tick(engine, 1_790_000_000, '0.98')
+        trade = algorithm.trade_task
+        await broadcast(engine, 1)
+        await asyncio.sleep(0.01)
+        broadcast_before_trip = len(engine.trades)
+        # Arrives while the first split is unconfirmed, and trips the breaker
+        await tick(engine, 1_790_000_001, '0.80')
+        tripped = algorithm.circuit_breaker.is_active
+        await algorithm.receipt_tracker.check_pending()
+        await trade
+        return engine, broadcast_before_trip, tripped, await algorithm.nonce_manager.allocate()
+
+    engine, broadcast_before_trip, tripped, next_nonce = asyncio.run(run())
+    assert broadcast_before_trip == 1
+    assert tripped
+    assert len(engine.trades) == 1
+    # The unused nonces go back, so the next trade starts right after the split
+    assert next_nonce == 1
+
+def test_ticks_during_a_trade_do_not_start_another():
+    async def run():
+        engine = trade_engine(splits=2)
+        algorithm = engine.algorithm
+        await tick(engine, 1_790_000_000, '0.98')
+        trade = algorithm.trade_task
+        await broadcast(engine, 1)
+        await tick(engine, 1_790_000_001, '0.98')
+        still_running = algorithm.trade_task is trade and not trade.done()
+        await algorithm.receipt_tracker.check_pending()
+        await broadcast(engine, 2)
+        await algorithm.receipt_tracker.check_pending()
+        await trade
+        return engine, still_running
+
+    engine, still_running = asyncio.run(run())
+    assert still_running
+    assert len(engine.trades) == 2
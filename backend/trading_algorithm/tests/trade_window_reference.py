@@ -0,0 +1,65 @@
+"""Reference for TradeOptimizer.find_optimal_trade_window.
+
+The per-candidate Python loop the vectorized search replaced, and the
+synthetic gas histories that the tests and the benchmark compare them on.
+"""
+import math
+import random
+from decimal import Decimal
+from datetime import datetime, timedelta
+from typing import Optional
+import numpy as np
+from trade_optimizer import TradeOptimizer, TradeWindow
+
+def build_optimizer(size: int, seed: int = 0, now: Optional[datetime] = None) -> TradeOptimizer:
+    """Optimizer with `size` random-walk gas observations spread over the hour before now"""
+    rng = random.Random(seed)
+    optimizer = TradeOptimizer()
+    if now is None:
+        now = datetime.now()
+    step = 3600 / (size + 1)
+    gas = 50.0
+    for i in range(size):
+        gas = min(150.0, max(20.0, gas + rng.gauss(0, 2)))
+        optimizer.add_gas_price(int(gas), now - timedelta(seconds=(size - i) * step))
+    return optimizer
+
+def legacy_find_window(optimizer: TradeOptimizer, size: Decimal,
+                       time_range: timedelta, now: Optional[datetime] = None) -> TradeWindow:
+    """The search as it was before vectorization, for comparison"""
+    if now is None:
+        now = datetime.now()
+    window_end = now + time_range
+    cutoff_time = (now - timedelta(hours=1)).timestamp()
+    recent_gas = [
+        (datetime.fromtimestamp(t), g)
+        for t, g in zip(optimizer.gas_history.timestamps(), optimizer.gas_history.values())
+        if t >= cutoff_time
+    ]
+    if not recent_gas:
+        return None
+    gas_times = np.array([(t.hour * 60 + t.minute) for t, _ in recent_gas])
+    gas_prices = np.array([g for _, g in recent_gas])
+    smooth_prices = np.convolve(gas_prices, np.ones(5)/5, mode='valid')
+    local_mins = (smooth_prices[1:-1] < smooth_prices[:-2]) & (smooth_prices[1:-1] < smooth_prices[2:])
+    best_window = None
+    best_confidence = 0
+    for i in range(len(local_mins)):
+        if local_mins[i]:
+            window_start = now + timedelta(minutes=int(gas_times[i]))
+            if window_start > window_end:
+                continue
+            local_volatility = np.std(gas_prices[max(0, i-5):min(len(gas_prices), i+6)])
+            confidence = 1.0 - (local_volatility / np.mean(gas_prices))
+            if confidence > best_confidence:
+                best_confidence = confidence
+                best_window = TradeWindow(window_start, window_start + timedelta(minutes=5),
+                                          size, int(gas_prices[i]), confidence)
+    return best_window
+
+def same_window(a: Optional[TradeWindow], b: Optional[TradeWindow]) -> bool:
+    """Whether two searches picked the same window, up to float rounding in the confidence"""
+    if a is None or b is None:
+        return a is b
+    return (a.start_time == b.start_time and a.estimated_gas == b.estimated_gas
+            and math.isclose(a.confidence, b.confidence, rel_tol=1e-9))
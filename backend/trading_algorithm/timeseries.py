@@ -0,0 +1,250 @@
+from typing import Optional
+import numpy as np
+
+class TimeSeriesBuffer:
+    """Preallocated time series with a timestamp column and a value column.
+
+    Samples are appended in time order. Expiry only advances the head index;
+    the live region is moved back to the front of the arrays when the tail
+    reaches the end, so every operation is amortized O(1) and the live
+    region is always one contiguous slice.
+    """
+
+    def __init__(self, capacity: int = 1024, with_values: bool = True):
+        self._timestamps = np.empty(capacity, dtype=np.float64)
+        self._values = np.empty(capacity, dtype=np.float64) if with_values else None
+        self._head = 0
+        self._tail = 0
+        # Absolute sequence number of array slot 0, so that readers can keep
+        # stable positions across compaction
+        self._base = 0
+
+    def __len__(self) -> int:
+        return self._tail - self._head
+
+    @property
+    def has_values(self) -> bool:
+        """Whether the buffer stores a value column"""
+        return self._values is not None
+
+    @property
+    def start_seq(self) -> int:
+        """Sequence number of the oldest live sample"""
+        return self._base + self._head
+
+    @property
+    def end_seq(self) -> int:
+        """Sequence number one past the newest live sample"""
+        return self._base + self._tail
+
+    def append(self, timestamp: float, value: float = 0.0):
+        """Append a sample at the tail"""
+        if self._tail == len(self._timestamps):
+            self._make_room()
+        self._timestamps[self._tail] = timestamp
+        if self._values is not None:
+            self._values[self._tail] = value
+        self._tail += 1
+
+    def expire(self, cutoff: float):
+        """Drop samples with timestamp <= cutoff"""
+        timestamps = self._timestamps
+        head, tail = self._head, self._tail
+        while head < tail and timestamps[head] <= cutoff:
+            head += 1
+        self._head = head
+        if head == tail:
+            # Empty buffer, restart at the front for free
+            self._base += head
+            self._head = self._tail = 0
+
+    def _make_room(self):
+        """Compact the live region to the front, growing if it is over half full"""
+        size = len(self)
+        capacity = len(self._timestamps)
+        if size > capacity // 2:
+            capacity *= 2
+        timestamps = np.empty(capacity, dtype=np.float64)
+        timestamps[:size] = self._timestamps[self._head:self._tail]
+        self._timestamps = timestamps
+        if self._values is not None:
+            values = np.empty(capacity, dtype=np.float64)
+            values[:size] = self._values[self._head:self._tail]
+            self._values = values
+        self._base += self._head
+        self._head = 0
+        self._tail = size
+
+    def timestamp_at(self, seq: int) -> float:
+        """Timestamp of the sample with the given sequence number"""
+        return float(self._timestamps[seq - self._base])
+
+    def value_at(self, seq: int) -> float:
+        """Value of the sample with the given sequence number"""
+        return float(self._values[seq - self._base])
+
+    def first(self) -> Optional[tuple[float, float]]:
+        """Oldest live (timestamp, value) pair"""
+        if not len(self):
+            return None
+        seq = self.start_seq
+        return self.timestamp_at(seq), self.value_at(seq)
+
+    def last(self) -> Optional[tuple[float, float]]:
+        """Newest live (timestamp, value) pair"""
+        if not len(self):
+            return None
+        seq = self.end_seq - 1
+        return self.timestamp_at(seq), self.value_at(seq)
+
+    def timestamps(self) -> np.ndarray:
+        """View of the live timestamps, oldest first"""
+        return self._timestamps[self._head:self._tail]
+
+    def values(self) -> np.ndarray:
+        """View of the live values, oldest first"""
+        return self._values[self._head:self._tail]
+
+
+class RollingWindow:
+    """Trailing time window over a TimeSeriesBuffer with streaming statistics.
+
+    Keeps the count, mean and sum of squared deviations of the samples whose
+    timestamps fall within `span` seconds of the last `update` time. New
+    samples are folded in and expired ones are evicted with windowed Welford
+    updates, so each tick costs O(1) amortized regardless of window length.
+    """
+
+    def __init__(self, buffer: TimeSeriesBuffer, span: float):
+        self.buffer = buffer
+        self.span = span
+        self._track_values = buffer.has_values
+        self._reset(buffer.start_seq)
+
+    def _reset(self, seq: int):
+        self._start = seq
+        self._end = seq
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def _add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def _remove(self, value: float):
+        if self.count <= 1:
+            self.count = 0
+            self.mean = 0.0
+            self._m2 = 0.0
+            return
+        old_mean = self.mean
+        self.count -= 1
+        self.mean = (old_mean * (self.count + 1) - value) / self.count
+        self._m2 = max(0.0, self._m2 - (value - old_mean) * (value - self.mean))
+
+    def update(self, now: float):
+        """Fold in newly appended samples and evict those older than now - span"""
+        buffer = self.buffer
+        if self._start < buffer.start_seq:
+            # The buffer expired samples we still held, rebuild from what is left
+            self._reset(buffer.start_seq)
+
+        while self._end < buffer.end_seq:
+            if self._track_values:
+                self._add(buffer.value_at(self._end))
+            else:
+                self.count += 1
+            self._end += 1
+
+        cutoff = now - self.span
+        while self._start < self._end and buffer.timestamp_at(self._start) < cutoff:
+            if self._track_values:
+                self._remove(buffer.value_at(self._start))
+            else:
+                self.count -= 1
+            self._start += 1
+
+    @property
+    def variance(self) -> float:
+        """Population variance of the samples in the window"""
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation of the samples in the window"""
+        return self.variance ** 0.5
+
+
+class PriceSeries:
+    """Fixed-memory per-second OHLC price series over a trailing horizon.
+
+    Each second maps to a slot in preallocated arrays. A slot is reused as
+    soon as its second falls out of the horizon, so expiry is continuous
+    and memory never grows. Updates within the same second fold into the
+    bucket's high, low, close and count instead of overwriting each other.
+    """
+
+    def __init__(self, horizon: int = 86400):
+        self.horizon = horizon
+        self.seconds = np.full(horizon, -1, dtype=np.int64)
+        self.open = np.zeros(horizon, dtype=np.float64)
+        self.high = np.zeros(horizon, dtype=np.float64)
+        self.low = np.zeros(horizon, dtype=np.float64)
+        self.close = np.zeros(horizon, dtype=np.float64)
+        self.count = np.zeros(horizon, dtype=np.int32)
+        self.last_second: Optional[int] = None
+
+    def add(self, timestamp: float, price: float):
+        """Fold a price observation into its one-second bucket, dropping it if older than the horizon"""
+        second = int(timestamp)
+        if self.last_second is not None and second <= self.last_second - self.horizon:
+            # Its slot now belongs to a newer second
+            return
+        slot = second % self.horizon
+        if self.seconds[slot] != second:
+            self.seconds[slot] = second
+            self.open[slot] = self.high[slot] = self.low[slot] = self.close[slot] = price
+            self.count[slot] = 1
+        else:
+            if price > self.high[slot]:
+                self.high[slot] = price
+            if price < self.low[slot]:
+                self.low[slot] = price
+            self.close[slot] = price
+            self.count[slot] += 1
+        if self.last_second is None or second > self.last_second:
+            self.last_second = second
+
+    def latest(self) -> Optional[float]:
+        """Close of the most recent bucket"""
+        if self.last_second is None:
+            return None
+        return float(self.close[self.last_second % self.horizon])
+
+    def range(self, start: int, end: int) -> dict[str, np.ndarray]:
+        """Populated buckets with start <= second < end, oldest first"""
+        if self.last_second is not None:
+            start = max(start, self.last_second - self.horizon + 1)
+        if end <= start:
+            start = end
+        seconds = np.arange(start, end, dtype=np.int64)
+        slots = seconds % self.horizon
+        live = self.seconds[slots] == seconds
+        slots = slots[live]
+        return {
+            'second': seconds[live],
+            'open': self.open[slots],
+            'high': self.high[slots],
+            'low': self.low[slots],
+            'close': self.close[slots],
+            'count': self.count[slots],
+        }
+
+    def __len__(self) -> int:
+        """Number of populated buckets within the horizon"""
+        if self.last_second is None:
+            return 0
+        return int(np.count_nonzero(self.seconds > self.last_second - self.horizon))
@@ -0,0 +1,43 @@
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Iterator
+import structlog
+from monitoring import TRADE_STAGE_DURATION
+
+logger = structlog.get_logger()
+
+# Stages of one trade, in pipeline order
+STAGES = (
+    'optimizer',
+    'window_wait',
+    'calldata',
+    'gas_estimate',
+    'nonce',
+    'signing',
+    'broadcast',
+    'receipt',
+)
+
+@contextmanager
+def trade_trace(**context) -> Iterator[str]:
+    """Bind a fresh correlation id to every structlog line logged within a trade.
+
+    The id lives in structlog contextvars, so tasks started inside the
+    block (such as the splits of a trade) carry it too, and it is unbound
+    again on exit.
+    """
+    trade_id = uuid.uuid4().hex[:16]
+    with structlog.contextvars.bound_contextvars(trade_id=trade_id, **context):
+        yield trade_id
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time one stage of a trade into the per-stage histogram, failed or not"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - started
+        TRADE_STAGE_DURATION.labels(stage=name).observe(duration)
+        logger.debug("trade_stage", stage=name, duration=duration)
@@ -1,9 +1,13 @@
+import time
 from decimal import Decimal
 from typing import Optional, List, Tuple
 from datetime import datetime, timedelta
 import numpy as np
 from dataclasses import dataclass
 import asyncio
+from timeseries import TimeSeriesBuffer
+from quantile_sketch import SlidingQuantileSketch
+from clock import Clock
 
 @dataclass
 class GasStrategy:
@@ -21,8 +25,12 @@ class TradeWindow:
     confidence: float
 
 class TradeOptimizer:
-    def __init__(self):
-        self.gas_history: List[Tuple[datetime, int]] = []
+    def __init__(self, clock: Optional[Clock] = None):
+        self.clock = clock or Clock()
+        # Raw gas observations (POSIX timestamp, price) for window analysis
+        self.gas_history = TimeSeriesBuffer()
+        # Gas price distribution over the full 24h history
+        self.gas_distribution = SlidingQuantileSketch(window_seconds=24 * 3600)
         self.trade_windows: List[TradeWindow] = []
         self.min_confidence = 0.7
         
@@ -37,33 +45,35 @@ class TradeOptimizer:
     def add_gas_price(self, gas_price: int, timestamp: Optional[datetime] = None):
         """Record gas price observation"""
         if timestamp is None:
-            timestamp = datetime.now()
-        self.gas_history.append((timestamp, gas_price))
-        self._cleanup_old_data()
-        
-    def _cleanup_old_data(self):
-        """Remove data older than 24 hours"""
-        cutoff_time = datetime.now() - timedelta(hours=24)
-        self.gas_history = [
-            (t, g) for t, g in self.gas_history 
-            if t > cutoff_time
-        ]
-        
-    def _get_gas_percentiles(self) -> Tuple[int, int, int]:
-        """Get 25th, 50th, and 75th percentile gas prices"""
-        recent_gas = [g for _, g in self.gas_history[-100:]]  # Last 100 observations
-        if not recent_gas:
+            timestamp = self.clock.now()
+        self.gas_history.append(timestamp.timestamp(), gas_price)
+        self.gas_distribution.add(gas_price, timestamp.timestamp())
+        self._cleanup_old_data(timestamp)
+        
+    def _cleanup_old_data(self, now: datetime):
+        """Remove data older than 24 hours before now"""
+        cutoff_time = now.timestamp() - 24 * 3600
+        self.gas_history.expire(cutoff_time)
+        
+    def _get_gas_percentiles(self, now: Optional[datetime] = None) -> Tuple[int, int, int]:
+        """Get 25th, 50th, and 75th percentile gas prices over the last 24 hours"""
+        if now is None:
+            now = self.clock.now()
+        self.gas_distribution.expire(now.timestamp())
+        percentiles = self.gas_distribution.quantiles([0.25, 0.5, 0.75])
+        if not percentiles:
             return 40, 50, 70  # Default values
             
-        return tuple(int(x) for x in np.percentile(recent_gas, [25, 50, 75]))
+        return tuple(int(round(x)) for x in percentiles)
         
-    def get_optimal_gas_price(self, urgency: str = 'medium') -> int:
+    def get_optimal_gas_price(self, urgency: str = 'medium',
+                              now: Optional[datetime] = None) -> int:
         """Calculate optimal gas price based on history and urgency"""
         if urgency not in self.gas_strategies:
             urgency = 'medium'
             
         strategy = self.gas_strategies[urgency]
-        p25, p50, p75 = self._get_gas_percentiles()
+        p25, p50, p75 = self._get_gas_percentiles(now)
         
         # Base price calculation
         if urgency == 'low':
@@ -84,66 +94,83 @@ class TradeOptimizer:
         
         return gas_price
         
+    @staticmethod
+    def _utc_offsets(timestamps: np.ndarray):
+        """Local UTC offset in seconds at each timestamp, or one scalar if it doesn't change"""
+        first = time.localtime(timestamps[0]).tm_gmtoff
+        if time.localtime(timestamps[-1]).tm_gmtoff == first:
+            return first
+        # The range crosses a DST change
+        return np.array([time.localtime(t).tm_gmtoff for t in timestamps])
+        
     async def find_optimal_trade_window(self, 
                                       size: Decimal,
-                                      time_range: timedelta = timedelta(minutes=15)
+                                      time_range: timedelta = timedelta(minutes=15),
+                                      now: Optional[datetime] = None
                                       ) -> Optional[TradeWindow]:
         """Find optimal trading window based on historical data"""
-        now = datetime.now()
-        window_end = now + time_range
+        if now is None:
+            now = self.clock.now()
         
-        # Get recent gas trends
-        recent_gas = [
-            (t, g) for t, g in self.gas_history 
-            if t >= now - timedelta(hours=1)
-        ]
+        # Get recent gas trends, located by binary search on the sorted timestamps
+        timestamps = self.gas_history.timestamps()
+        start = np.searchsorted(timestamps, (now - timedelta(hours=1)).timestamp(), side='left')
+        recent_times = timestamps[start:]
+        gas_prices = self.gas_history.values()[start:]
         
-        if not recent_gas:
+        if not len(gas_prices):
             return None
             
-        # Analyze gas price patterns
-        gas_times = np.array([(t.hour * 60 + t.minute) for t, _ in recent_gas])
-        gas_prices = np.array([g for _, g in recent_gas])
+        # Analyze gas price patterns (local minute of day of each observation)
+        gas_times = ((recent_times + self._utc_offsets(recent_times)) // 60 % 1440).astype(np.int64)
         
         # Find local minima in gas prices
         smooth_prices = np.convolve(gas_prices, np.ones(5)/5, mode='valid')
         local_mins = (smooth_prices[1:-1] < smooth_prices[:-2]) & (smooth_prices[1:-1] < smooth_prices[2:])
         
-        if not any(local_mins):
+        if not local_mins.any():
             # No clear optimal window found
             return TradeWindow(
                 start_time=now,
                 end_time=now + timedelta(minutes=5),
                 optimal_size=size,
-                estimated_gas=self.get_optimal_gas_price('medium'),
+                estimated_gas=self.get_optimal_gas_price('medium', now),
                 confidence=0.5
             )
             
-        # Find best window
-        best_window = None
-        best_confidence = 0
-        
-        for i in range(len(local_mins)):
-            if local_mins[i]:
-                window_start = datetime.now() + timedelta(minutes=int(gas_times[i]))
-                if window_start > window_end:
-                    continue
-                    
-                # Calculate confidence based on gas price stability
-                local_volatility = np.std(gas_prices[max(0, i-5):min(len(gas_prices), i+6)])
-                confidence = 1.0 - (local_volatility / np.mean(gas_prices))
-                
-                if confidence > best_confidence:
-                    best_confidence = confidence
-                    best_window = TradeWindow(
-                        start_time=window_start,
-                        end_time=window_start + timedelta(minutes=5),
-                        optimal_size=size,
-                        estimated_gas=int(gas_prices[i]),
-                        confidence=confidence
-                    )
-                    
-        return best_window
+        # Candidate windows that start within the requested time range
+        candidates = np.flatnonzero(local_mins)
+        candidates = candidates[gas_times[candidates] * 60 <= time_range.total_seconds()]
+        if not len(candidates):
+            return None
+            
+        # Gas price stability around every candidate at once, from prefix sums
+        # over the clipped [i-5, i+6) neighbourhoods
+        n = len(gas_prices)
+        sums = np.concatenate(([0.0], np.cumsum(gas_prices)))
+        square_sums = np.concatenate(([0.0], np.cumsum(gas_prices * gas_prices)))
+        lo = np.maximum(candidates - 5, 0)
+        hi = np.minimum(candidates + 6, n)
+        counts = hi - lo
+        means = (sums[hi] - sums[lo]) / counts
+        variances = np.maximum((square_sums[hi] - square_sums[lo]) / counts - means * means, 0.0)
+        confidences = 1.0 - np.sqrt(variances) / gas_prices.mean()
+        
+        # Rank candidates, earliest wins ties; the prefix sums carry rounding
+        # error, so confidences within 1e-12 of the best count as tied
+        best = int(np.argmax(confidences >= confidences.max() - 1e-12))
+        if confidences[best] <= 0:
+            return None
+            
+        i = candidates[best]
+        window_start = now + timedelta(minutes=int(gas_times[i]))
+        return TradeWindow(
+            start_time=window_start,
+            end_time=window_start + timedelta(minutes=5),
+            optimal_size=size,
+            estimated_gas=int(gas_prices[i]),
+            confidence=float(confidences[best])
+        )
         
     def should_split_trade(self, size: Decimal, gas_price: int) -> List[Decimal]:
         """Determine if trade should be split for gas optimization"""
@@ -163,23 +190,28 @@ class TradeOptimizer:
         
     async def optimize_trade_execution(self, 
                                      size: Decimal,
-                                     max_wait: int = 300  # 5 minutes
+                                     max_wait: int = 300,  # 5 minutes
+                                     now: Optional[datetime] = None
                                      ) -> Tuple[List[Decimal], int, int]:
         """Optimize trade execution strategy"""
+        if now is None:
+            now = self.clock.now()
+            
         # Find optimal window
         window = await self.find_optimal_trade_window(
             size,
-            time_range=timedelta(seconds=max_wait)
+            time_range=timedelta(seconds=max_wait),
+            now=now
         )
         
         if not window or window.confidence < self.min_confidence:
             # Immediate execution with current gas price
-            gas_price = self.get_optimal_gas_price('medium')
+            gas_price = self.get_optimal_gas_price('medium', now)
             splits = self.should_split_trade(size, gas_price)
             return splits, gas_price, 0
             
         # Calculate wait time
-        wait_time = int((window.start_time - datetime.now()).total_seconds())
+        wait_time = int((window.start_time - now).total_seconds())
         splits = self.should_split_trade(size, window.estimated_gas)
         
         return splits, window.estimated_gas, wait_time 
\ No newline at end of file
@@ -1,71 +1,151 @@
 import os
 import time
 import json
-import logging
 import asyncio
 from decimal import Decimal
 import pandas as pd
-from typing import Dict, Tuple, Optional
+from typing import List, Tuple, Optional
+from web3 import Web3
+from eth_account.datastructures import SignedTransaction
 from dotenv import load_dotenv
-from tatum_utils import TatumProvider
+from tatum_utils import TatumProvider, AsyncTatumProvider, is_nonce_error
+from nonce_manager import NonceManager
+from receipt_tracker import ReceiptTracker, ReceiptTimeout
+from gas_oracle import GasOracle
+from tx_templates import TransactionTemplates, function_selector, encode_address, decode_uint256
 from datetime import datetime, timedelta
 from circuit_breaker import CircuitBreaker
 from trade_optimizer import TradeOptimizer
 from monitoring import MonitoringService
+from timeseries import PriceSeries
+from clock import Clock, MonotonicClock
+from log_pipeline import configure_logging
+from tracing import trade_trace, stage
+from runtime_health import RuntimeHealth
+from signing import SigningService
+from pending_transactions import PendingTransactionManager
+from rpc_pool import RpcPool
+from dataclasses import dataclass
 import orjson
 import pytz
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger(__name__)
-
 # Load environment variables
 load_dotenv()
 
+class TradeReverted(Exception):
+    """Raised when a mined mint or burn has a failed receipt status"""
+
+    def __init__(self, tx_hash: str, receipt: dict):
+        super().__init__(f"Transaction {tx_hash} reverted")
+        self.receipt = receipt
+
+@dataclass
+class MarketState:
+    oracle_price: Decimal
+    total_supply: Decimal
+    balance: Decimal
+
 class TradingAlgorithm:
-    def __init__(self):
-        # Initialize services
+    def __init__(self,
+                 tatum_async: Optional[AsyncTatumProvider] = None,
+                 monitoring: Optional[MonitoringService] = None,
+                 clock: Optional[Clock] = None,
+                 contract_abi: Optional[list] = None,
+                 private_key: Optional[str] = None,
+                 master_control_address: Optional[str] = None):
+        # Initialize services; providers, monitoring and clock can be
+        # swapped out to run the pipeline offline
+        self.clock = clock or MonotonicClock()
+        if tatum_async is None and os.getenv('TATUM_BASE_URLS'):
+            # Several endpoints: route to the fastest and hedge slow reads
+            tatum_async = RpcPool.from_env()
+        self.tatum_async = tatum_async or AsyncTatumProvider()
         self.tatum = TatumProvider()
-        self.w3 = self.tatum.get_web3_provider()
-        self.circuit_breaker = CircuitBreaker()
-        self.trade_optimizer = TradeOptimizer()
-        self.monitoring = MonitoringService()
+        self.circuit_breaker = CircuitBreaker(clock=self.clock)
+        self.trade_optimizer = TradeOptimizer(clock=self.clock)
+        self.monitoring = monitoring or MonitoringService()
+        self.gas_oracle = GasOracle(
+            self.tatum_async,
+            self.trade_optimizer,
+            self.monitoring,
+            interval=float(os.getenv('GAS_ORACLE_INTERVAL', '15')),
+            max_age=float(os.getenv('GAS_PRICE_MAX_AGE', '60'))
+        )
         
         # Load configuration
-        self.private_key = os.getenv('PRIVATE_KEY')
-        self.master_control_address = os.getenv('MASTER_CONTROL_ADDRESS')
+        self.private_key = private_key or os.getenv('PRIVATE_KEY')
+        self.master_control_address = master_control_address or os.getenv('MASTER_CONTROL_ADDRESS')
         self.webhook_url = os.getenv('WEBHOOK_URL')
         
         # Load ABI
-        with open('MasterControl.json') as f:
-            contract_json = orjson.loads(f.read())
-            self.contract_abi = contract_json['abi']
+        if contract_abi is None:
+            with open('MasterControl.json') as f:
+                contract_json = orjson.loads(f.read())
+                contract_abi = contract_json['abi']
+        self.contract_abi = contract_abi
         
-        self.contract = self.w3.eth.contract(
-            address=self.master_control_address,
-            abi=self.contract_abi
+        self.price_history = PriceSeries(horizon=86400)  # 24h of per-second OHLC
+        # The key is derived once; signing runs on its own executor
+        self.signer = SigningService(
+            self.private_key,
+            max_workers=int(os.getenv('SIGNING_WORKERS', '2')),
+            use_processes=os.getenv('SIGNING_PROCESSES', 'false').lower() == 'true'
+        )
+        self.account = self.signer.account
+        self.nonce_manager = NonceManager(self.tatum_async, self.account.address)
+        self.market_state_calls = [
+            '0x' + function_selector('getLatestPrice()'),
+            '0x' + function_selector('totalSupply()'),
+            '0x' + function_selector('balanceOf(address)') + encode_address(self.account.address),
+        ]
+        self.tx_templates = TransactionTemplates(
+            self.tatum_async,
+            self.account.address,
+            self.master_control_address
+        )
+        self.receipt_tracker = ReceiptTracker(
+            self.tatum_async,
+            timeout=float(os.getenv('RECEIPT_TIMEOUT', '300'))
+        )
+        self.pending_transactions = PendingTransactionManager(
+            self.tatum_async,
+            self.receipt_tracker,
+            self.signer,
+            self.trade_optimizer,
+            stuck_blocks=int(os.getenv('STUCK_TX_BLOCKS', '5'))
         )
-        
-        self.price_history: Dict[int, Decimal] = {}
-        self.account = self.w3.eth.account.from_key(self.private_key)
         self.last_trade_time: Optional[datetime] = None
+        # The trade in flight, if any; it runs off the PRICE_UPDATE worker
+        self.trade_task: Optional[asyncio.Task] = None
         self.min_trade_interval = timedelta(minutes=5)
+        self.max_concurrent_splits = int(os.getenv('MAX_CONCURRENT_SPLITS', '5'))
+        self.runtime_health = RuntimeHealth(
+            interval=float(os.getenv('LOOP_LAG_INTERVAL', '0.5'))
+        )
         
         # Initialize timezone
         self.timezone = pytz.timezone('UTC')
         
     async def get_current_price(self) -> Decimal:
-        """Get current price from Chainlink oracle"""
+        """Get current price from Chainlink oracle; prefer read_market_state, which reads it in the same batch"""
+        return (await self.read_market_state()).oracle_price
+        
+    async def read_market_state(self) -> MarketState:
+        """Read oracle price, total supply and our balance in one JSON-RPC batch"""
         try:
-            price = await asyncio.to_thread(
-                self.contract.functions.getLatestPrice().call
+            price, supply, balance = (
+                decode_uint256(result)
+                for result in await self.tatum_async.batch_call(
+                    [(self.master_control_address, data) for data in self.market_state_calls]
+                )
+            )
+            return MarketState(
+                oracle_price=Decimal(price) / Decimal(1e8),
+                total_supply=Decimal(supply) / Decimal(1e18),
+                balance=Decimal(balance) / Decimal(1e18)
             )
-            return Decimal(price) / Decimal(1e8)
         except Exception as e:
-            self.monitoring.log_error(e, {'method': 'get_current_price'})
+            self.monitoring.log_error(e, {'method': 'read_market_state'})
             raise
             
     def calculate_trade_size(self, price: Decimal, volume: Decimal) -> Tuple[Decimal, bool]:
@@ -91,79 +171,177 @@ class TradingAlgorithm:
         
         return trade_size, should_mint
         
-    def execute_trade(self, size: Decimal, is_mint: bool):
-        """Execute mint or burn transaction"""
-        try:
-            # Convert to Wei
-            amount_wei = int(size * Decimal(1e18))
+    async def prepare_trades(self, sizes: List[Decimal], is_mint: bool,
+                             gas_price: Optional[int] = None) -> List[Tuple[dict, SignedTransaction]]:
+        """
+        Build, number and sign one mint or burn transaction per size, signing them as one batch.
+        gas_price is in Gwei as chosen by the optimizer; current network price if omitted
+        """
+        function = 'mint' if is_mint else 'burn'
+        # Convert to Wei
+        amounts_wei = [int(size * Decimal(1e18)) for size in sizes]
+        
+        # Encode call data from the precomputed selector
+        with stage('calldata'):
+            tx_data = [self.tx_templates.encode(function, amount_wei) for amount_wei in amounts_wei]
+        
+        # Gas limit is estimated via Tatum once per amount bucket
+        with stage('gas_estimate'):
+            gas_limits = [
+                await self.tx_templates.gas_limit(function, amount_wei, data)
+                for amount_wei, data in zip(amounts_wei, tx_data)
+            ]
             
-            # Build transaction
-            if is_mint:
-                tx = self.contract.functions.mint(amount_wei)
+            if gas_price is None:
+                # Current gas price from the oracle cache
+                gas_price_wei = await self.gas_oracle.get_gas_price()
             else:
-                tx = self.contract.functions.burn(amount_wei)
-            
-            # Get transaction data
-            tx_data = tx.build_transaction()['data']
-            
-            # Estimate gas using Tatum
-            gas_limit = self.tatum.estimate_gas(
-                self.account.address,
-                self.master_control_address,
-                tx_data
-            )
-            
-            # Get current gas price and nonce from Tatum
-            gas_price = self.tatum.get_gas_price()
-            nonce = self.tatum.get_nonce(self.account.address)
-            
-            # Build transaction
-            transaction = {
-                'from': self.account.address,
-                'to': self.master_control_address,
-                'nonce': nonce,
-                'gas': gas_limit,
-                'gasPrice': gas_price,
-                'data': tx_data
-            }
+                gas_price_wei = Web3.to_wei(gas_price, 'gwei')
+        
+        # Build transactions, numbered in the order they will be broadcast
+        transactions = []
+        with stage('nonce'):
+            for gas_limit, data in zip(gas_limits, tx_data):
+                transactions.append({
+                    'from': self.account.address,
+                    'to': self.master_control_address,
+                    'gas': gas_limit,
+                    'gasPrice': gas_price_wei,
+                    'data': data,
+                    'nonce': await self.nonce_manager.allocate()
+                })
+        
+        # Sign the batch across the signing workers
+        try:
+            with stage('signing'):
+                signed = await self.signer.sign_many(transactions)
+        except Exception:
+            self.release_trades([(transaction, None) for transaction in transactions])
+            raise
+        return list(zip(transactions, signed))
+        
+    def release_trades(self, prepared: List[Tuple[dict, SignedTransaction]]):
+        """Hand back the nonces of prepared transactions that will not be broadcast"""
+        for transaction, _ in prepared:
+            self.nonce_manager.release(transaction['nonce'])
             
-            # Sign transaction
-            signed_tx = self.w3.eth.account.sign_transaction(transaction, self.private_key)
+    async def submit_trade(self, size: Decimal, is_mint: bool,
+                           gas_price: Optional[int] = None,
+                           prepared: Optional[Tuple[dict, SignedTransaction]] = None) -> str:
+        """
+        Sign and broadcast a mint or burn transaction, returning its hash.
+        gas_price is in Gwei as chosen by the optimizer; current network price if omitted.
+        prepared is a (transaction, signed) pair from prepare_trades to broadcast instead
+        """
+        if prepared is None:
+            prepared, = await self.prepare_trades([size], is_mint, gas_price)
+        transaction, signed_tx = prepared
+        
+        for attempt in range(2):
+            if attempt:
+                # Rejected nonce: number and sign the same transaction again
+                with stage('nonce'):
+                    transaction['nonce'] = await self.nonce_manager.allocate()
+                with stage('signing'):
+                    signed_tx = await self.signer.sign(transaction)
             
             # Broadcast via Tatum
-            tx_hash = self.tatum.broadcast_signed_transaction(signed_tx.rawTransaction.hex())
-            
-            # Wait for receipt
-            receipt = None
-            while not receipt:
-                receipt = self.tatum.get_transaction_receipt(tx_hash)
-                if not receipt:
-                    time.sleep(1)
-            
-            logger.info(f"{'Mint' if is_mint else 'Burn'} transaction successful: {tx_hash}")
-            return receipt
+            try:
+                with stage('broadcast'):
+                    tx_hash = await self.tatum_async.broadcast_signed_transaction(
+                        signed_tx.rawTransaction.hex()
+                    )
+            except Exception as e:
+                if not is_nonce_error(e):
+                    # Not on the network, so the nonce can be reused if nothing came after it
+                    self.nonce_manager.release(transaction['nonce'])
+                    raise
+                # The nonce may be taken by this very transaction, mined from an
+                # earlier attempt that timed out on our side
+                tx_hash = signed_tx.hash.hex()
+                if await self.tatum_async.get_transaction_receipt(tx_hash):
+                    self.pending_transactions.add(transaction, tx_hash)
+                    return tx_hash
+                # Taken by another transaction: skip past everything the node knows of
+                self.nonce_manager.complete(transaction['nonce'])
+                await self.nonce_manager.resync()
+                if attempt:
+                    raise
+                self.monitoring.log_warning(
+                    "Nonce rejected, resyncing",
+                    {'nonce': transaction['nonce'], 'error': str(e)}
+                )
+            else:
+                # Watched for stuck blocks until mined, and replaced at a higher fee if needed
+                self.pending_transactions.add(transaction, tx_hash)
+                return tx_hash
+                
+    async def wait_for_receipt(self, tx_hash: str) -> dict:
+        """Wait until a broadcast transaction, or a replacement of it, is mined"""
+        nonce = self.pending_transactions.by_hash[tx_hash].transaction['nonce']
+        try:
+            with stage('receipt'):
+                receipt = await self.pending_transactions.wait_for(tx_hash)
+        except ReceiptTimeout:
+            self.nonce_manager.complete(nonce)
+            # Moves back to this nonce only if the node no longer holds the transaction
+            await self.nonce_manager.resync()
+            raise
+        self.nonce_manager.complete(nonce)
+        return receipt
+        
+    async def confirm_trade(self, tx_hash: str, size: Decimal, is_mint: bool) -> dict:
+        """Wait for a broadcast mint or burn to be mined, raising TradeReverted if it failed"""
+        receipt = await self.wait_for_receipt(tx_hash)
+        
+        if receipt.get('status') == 0:
+            # Reverted, possibly out of gas, so re-estimate next time
+            self.tx_templates.invalidate(
+                'mint' if is_mint else 'burn',
+                int(size * Decimal(1e18))
+            )
+            raise TradeReverted(tx_hash, receipt)
+        
+        self.monitoring.log_info(
+            "Transaction successful",
+            {'function': 'mint' if is_mint else 'burn', 'tx_hash': tx_hash}
+        )
+        return receipt
+        
+    async def execute_trade(self, size: Decimal, is_mint: bool,
+                            gas_price: Optional[int] = None):
+        """Execute mint or burn transaction"""
+        try:
+            tx_hash = await self.submit_trade(size, is_mint, gas_price)
+            return await self.confirm_trade(tx_hash, size, is_mint)
             
         except Exception as e:
-            logger.error(f"Error executing trade: {e}")
+            self.monitoring.log_error(e, {
+                'method': 'execute_trade',
+                'size': str(size),
+                'is_mint': is_mint
+            })
             raise
             
     async def handle_price_update(self, data: dict):
         """Handle real-time price updates"""
         try:
             price = Decimal(data['price']) / Decimal(1e8)
-            current_time = int(time.time())
+            
+            # Read the clock once and pass it down the pipeline for this tick
+            now = self.clock.now()
             
             # Update monitoring
             self.monitoring.update_price(float(price))
             
             # Update circuit breaker
-            self.circuit_breaker.add_price_data(price)
+            self.circuit_breaker.add_price_data(price, now)
             
             # Store price history
-            self.price_history[current_time] = price
+            self.price_history.add(now.timestamp(), float(price))
             
             # Check circuit breaker
-            should_break, reason = self.circuit_breaker.should_break_circuit()
+            should_break, reason = self.circuit_breaker.should_break_circuit(now)
             if should_break:
                 self.monitoring.log_warning(
                     "Circuit breaker activated",
@@ -171,31 +349,37 @@ class TradingAlgorithm:
                 )
                 return
             
+            # One trade at a time; ticks keep reaching the breaker while it runs
+            if self.trade_task is not None and not self.trade_task.done():
+                return
+            
             # Check if we should trade
-            if await self.should_execute_trade(price):
-                volume = Decimal(
-                    await asyncio.to_thread(
-                        self.contract.functions.totalSupply().call
-                    )
-                ) / Decimal(1e18)
+            if await self.should_execute_trade(price, now):
+                market_state = await self.read_market_state()
+                volume = market_state.total_supply
                 
                 self.monitoring.update_volume(float(volume))
-                self.circuit_breaker.add_volume_data(volume)
+                self.circuit_breaker.add_volume_data(volume, now)
                 
                 trade_size, should_mint = self.calculate_trade_size(price, volume)
                 
                 if trade_size >= Decimal('100'):
-                    await self.execute_trade_async(trade_size, should_mint)
+                    self.trade_task = asyncio.ensure_future(
+                        self.execute_trade_async(trade_size, should_mint, now)
+                    )
                     
         except Exception as e:
             self.monitoring.log_error(e, {'method': 'handle_price_update'})
             
-    async def should_execute_trade(self, current_price: Decimal) -> bool:
+    async def should_execute_trade(self, current_price: Decimal,
+                                   now: Optional[datetime] = None) -> bool:
         """Determine if we should execute a trade based on conditions"""
         if not self.last_trade_time:
             return True
             
-        time_since_last_trade = datetime.now(self.timezone) - self.last_trade_time
+        if now is None:
+            now = self.clock.now()
+        time_since_last_trade = now.astimezone(self.timezone) - self.last_trade_time
         if time_since_last_trade < self.min_trade_interval:
             return False
             
@@ -204,42 +388,84 @@ class TradingAlgorithm:
         
         return price_deviation >= Decimal('0.01')
         
-    async def execute_trade_async(self, size: Decimal, is_mint: bool):
+    async def execute_trade_async(self, size: Decimal, is_mint: bool,
+                                  now: Optional[datetime] = None):
         """Execute trade asynchronously with optimization"""
         start_time = time.time()
         
-        try:
-            # Get trade optimization
-            splits, gas_price, wait_time = await self.trade_optimizer.optimize_trade_execution(
-                size,
-                max_wait=300
-            )
-            
-            if wait_time > 0:
-                self.monitoring.log_info(
-                    "Waiting for optimal trade window",
-                    {'wait_time': wait_time, 'gas_price': gas_price}
-                )
-                await asyncio.sleep(wait_time)
-            
-            # Execute splits
-            for split_size in splits:
-                receipt = await asyncio.to_thread(
-                    self.execute_trade,
-                    split_size,
-                    is_mint,
-                    gas_price
-                )
+        # Every log line of this trade and its splits carries one trade_id
+        with trade_trace():
+            try:
+                # Get trade optimization
+                with stage('optimizer'):
+                    splits, gas_price, wait_time = await self.trade_optimizer.optimize_trade_execution(
+                        size,
+                        max_wait=300,
+                        now=now
+                    )
                 
-                if receipt:
-                    self.monitoring.record_trade(
-                        success=True,
-                        gas_used=receipt['gasUsed'],
-                        duration=time.time() - start_time
+                if wait_time > 0:
+                    self.monitoring.log_info(
+                        "Waiting for optimal trade window",
+                        {'wait_time': wait_time, 'gas_price': gas_price}
                     )
-                    self.last_trade_time = datetime.now(self.timezone)
-                    self.circuit_breaker.record_trade()
-                    
+                    with stage('window_wait'):
+                        await self.clock.sleep(wait_time)
+                
+                # Broadcast splits one at a time at the optimizer's gas price,
+                # with at most max_concurrent_splits awaiting their receipts
+                # Splits are numbered and signed up front as one batch
+                prepared = await self.prepare_trades(splits, is_mint, gas_price)
+                semaphore = asyncio.Semaphore(self.max_concurrent_splits)
+                confirmations = []
+                for i, (split_size, trade) in enumerate(zip(splits, prepared)):
+                    await semaphore.acquire()
+                    # Checked right before each broadcast, after the previous
+                    # split was recorded and with every tick that arrived
+                    # meanwhile, so a trip stops the rest of the trade
+                    should_break, reason = self.circuit_breaker.should_break_circuit()
+                    if should_break:
+                        semaphore.release()
+                        self.release_trades(prepared[i:])
+                        self.monitoring.log_warning(
+                            "Circuit breaker activated, skipping remaining splits",
+                            {'reason': reason, 'remaining': len(splits) - i}
+                        )
+                        break
+                    tx_hash = await self._submit_split(split_size, is_mint, gas_price, trade, start_time)
+                    if tx_hash is None:
+                        semaphore.release()
+                        # Later splits would wait behind the unused nonce forever
+                        self.release_trades(prepared[i + 1:])
+                        if i + 1 < len(splits):
+                            self.monitoring.log_warning(
+                                "Split broadcast failed, skipping remaining splits",
+                                {'remaining': len(splits) - i - 1}
+                            )
+                        break
+                    confirmations.append(asyncio.ensure_future(
+                        self._confirm_split(tx_hash, split_size, is_mint, semaphore, start_time)
+                    ))
+                await asyncio.gather(*confirmations)
+                        
+            except Exception as e:
+                self.monitoring.record_trade(
+                    success=False,
+                    gas_used=0,
+                    duration=time.time() - start_time
+                )
+                self.monitoring.log_error(e, {
+                    'method': 'execute_trade_async',
+                    'size': str(size),
+                    'is_mint': is_mint
+                })
+                
+    async def _submit_split(self, size: Decimal, is_mint: bool, gas_price: int,
+                            prepared: Tuple[dict, SignedTransaction],
+                            start_time: float) -> Optional[str]:
+        """Broadcast one prepared split of a trade, returning its hash or None if it failed"""
+        try:
+            tx_hash = await self.submit_trade(size, is_mint, gas_price, prepared=prepared)
         except Exception as e:
             self.monitoring.record_trade(
                 success=False,
@@ -247,11 +473,47 @@ class TradingAlgorithm:
                 duration=time.time() - start_time
             )
             self.monitoring.log_error(e, {
-                'method': 'execute_trade_async',
+                'method': '_submit_split',
+                'size': str(size),
+                'is_mint': is_mint
+            })
+            return None
+        # Counted at broadcast, so splits still waiting to be mined
+        # count towards the trade frequency the breaker checks
+        self.circuit_breaker.record_trade()
+        return tx_hash
+        
+    async def _confirm_split(self, tx_hash: str, size: Decimal, is_mint: bool,
+                             semaphore: asyncio.Semaphore,
+                             start_time: float) -> Optional[dict]:
+        """Wait for one broadcast split and record its outcome"""
+        try:
+            receipt = await self.confirm_trade(tx_hash, size, is_mint)
+        except Exception as e:
+            self.monitoring.record_trade(
+                success=False,
+                # A revert is mined and still pays for its gas
+                gas_used=e.receipt['gasUsed'] if isinstance(e, TradeReverted) else 0,
+                duration=time.time() - start_time
+            )
+            self.monitoring.log_error(e, {
+                'method': '_confirm_split',
+                'tx_hash': tx_hash,
                 'size': str(size),
                 'is_mint': is_mint
             })
+            return None
+        finally:
+            semaphore.release()
             
+        self.monitoring.record_trade(
+            success=True,
+            gas_used=receipt['gasUsed'],
+            duration=time.time() - start_time
+        )
+        self.last_trade_time = datetime.fromtimestamp(self.clock.time(), self.timezone)
+        return receipt
+        
     async def monitor_metrics(self):
         """Monitor and log performance metrics"""
         while True:
@@ -283,42 +545,47 @@ class TradingAlgorithm:
                 
             await asyncio.sleep(300)
             
-    async def cleanup_old_data(self):
-        """Clean up old price history and metrics"""
-        while True:
-            try:
-                current_time = int(time.time())
-                self.price_history = {
-                    k: v for k, v in self.price_history.items()
-                    if current_time - k <= 86400
-                }
-            except Exception as e:
-                self.monitoring.log_error(e, {'method': 'cleanup_old_data'})
-                
-            await asyncio.sleep(3600)
-            
     async def run_async(self):
         """Main async trading loop"""
         try:
+            # Instrument the default executor before anything uses it
+            self.runtime_health.install()
+            
             # Set up monitoring
             self.tatum.monitor_address(self.master_control_address, self.webhook_url)
             
-            # Subscribe to price updates
+            # Subscribe to price updates and new blocks
             await self.tatum.subscribe_to_events(
-                ['PRICE_UPDATE', 'BLOCK_MINED'],
+                ['PRICE_UPDATE'],
                 self.handle_price_update
             )
+            await self.tatum.subscribe_to_events(
+                ['BLOCK_MINED'],
+                self.receipt_tracker.on_block
+            )
+            # After the receipt check, so only transactions still pending are replaced
+            await self.tatum.subscribe_to_events(
+                ['BLOCK_MINED'],
+                self.pending_transactions.on_block
+            )
             
             # Start all background tasks
             await asyncio.gather(
                 self.tatum.start_websocket_listener(),
-                self.monitor_metrics(),
-                self.cleanup_old_data()
+                self.receipt_tracker.run(),
+                self.gas_oracle.run(),
+                self.runtime_health.run(),
+                self.monitor_metrics()
             )
             
         except Exception as e:
             self.monitoring.log_error(e, {'method': 'run_async'})
             raise
+        finally:
+            if self.trade_task is not None:
+                self.trade_task.cancel()
+            await self.tatum_async.close()
+            self.signer.close()
             
     def run(self):
         """Entry point for the trading algorithm"""
@@ -329,5 +596,6 @@ class TradingAlgorithm:
             raise
 
 if __name__ == "__main__":
+    configure_logging()
     algorithm = TradingAlgorithm()
     algorithm.run() 
\ No newline at end of file
@@ -0,0 +1,69 @@
+import time
+from typing import Dict, Tuple
+from web3 import Web3
+from tatum_utils import AsyncTatumProvider
+
+def function_selector(signature: str) -> str:
+    """4-byte selector of a function signature, hex encoded without prefix"""
+    return bytes(Web3.keccak(text=signature)[:4]).hex()
+
+def encode_uint256(value: int) -> str:
+    """ABI-encode a uint256 argument, hex encoded without prefix"""
+    return value.to_bytes(32, 'big').hex()
+
+def encode_address(address: str) -> str:
+    """ABI-encode an address argument, hex encoded without prefix"""
+    return address[2:].lower().rjust(64, '0')
+
+def decode_uint256(result: str) -> int:
+    """Decode a uint256 return value from eth_call; an empty result means the call returned nothing"""
+    if not result or result == '0x':
+        raise ValueError(f"Empty eth_call result {result!r}, the call reverted or the contract is missing")
+    return int(result, 16)
+
+class TransactionTemplates:
+    """Precompiled call data and cached gas limits for MasterControl trades"""
+
+    SIGNATURES = {
+        'mint': 'mint(uint256)',
+        'burn': 'burn(uint256)',
+    }
+
+    def __init__(self, tatum: AsyncTatumProvider, from_address: str, to_address: str,
+                 gas_margin: float = 1.1, gas_ttl: float = 600.0):
+        self.tatum = tatum
+        self.from_address = from_address
+        self.to_address = to_address
+        self.gas_margin = gas_margin
+        self.gas_ttl = gas_ttl
+        self.selectors = {
+            name: function_selector(signature)
+            for name, signature in self.SIGNATURES.items()
+        }
+        # (function, amount bucket) -> (gas limit, cached at)
+        self.gas_limits: Dict[Tuple[str, int], Tuple[int, float]] = {}
+
+    @staticmethod
+    def amount_bucket(amount: int) -> int:
+        """Power-of-two bucket of an amount, which fixes its calldata cost"""
+        return amount.bit_length()
+
+    def encode(self, function: str, amount: int) -> str:
+        """Build call data for mint/burn of amount"""
+        return '0x' + self.selectors[function] + encode_uint256(amount)
+
+    async def gas_limit(self, function: str, amount: int, data: str) -> int:
+        """Gas limit for a call, estimated once per (function, amount bucket)"""
+        key = (function, self.amount_bucket(amount))
+        cached = self.gas_limits.get(key)
+        if cached is not None and time.monotonic() - cached[1] < self.gas_ttl:
+            return cached[0]
+
+        estimate = await self.tatum.estimate_gas(self.from_address, self.to_address, data)
+        gas_limit = int(estimate * self.gas_margin)
+        self.gas_limits[key] = (gas_limit, time.monotonic())
+        return gas_limit
+
+    def invalidate(self, function: str, amount: int):
+        """Drop a cached gas limit, e.g. after an out-of-gas failure"""
+        self.gas_limits.pop((function, self.amount_bucket(amount)), None)
@@ -0,0 +1,148 @@
+import json
+import time
+import random
+import asyncio
+import logging
+from typing import Dict, List, Optional
+import websockets
+from event_dispatcher import EventDispatcher
+from monitoring import WS_RECONNECT_GAP
+
+logger = logging.getLogger(__name__)
+
+class WebSocketManager:
+    """Keeps the Tatum event stream subscribed across disconnects.
+
+    Runs `1 + standby` connections, each in its own slot that reconnects
+    with full-jitter exponential backoff starting at `initial_backoff`
+    seconds. One connection is active: it carries every SUBSCRIBE sent so
+    far and feeds its messages to the dispatcher. The rest stay connected
+    but unsubscribed, so when the active one drops a standby is promoted
+    by replaying the subscriptions on it, without a new handshake. The
+    time from losing the active connection until a replacement is
+    subscribed is observed in `ws_reconnect_gap_seconds`.
+    """
+
+    def __init__(self, urls: List[str], dispatcher: EventDispatcher,
+                 standby: int = 0,
+                 initial_backoff: float = 0.05,
+                 max_backoff: float = 30.0,
+                 stable_after: float = 10.0,
+                 ping_interval: float = 10.0,
+                 open_timeout: float = 10.0):
+        if not urls:
+            raise ValueError("WebSocketManager needs at least one URL")
+        self.urls = urls
+        self.dispatcher = dispatcher
+        self.standby = standby
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.stable_after = stable_after
+        self.ping_interval = ping_interval
+        self.open_timeout = open_timeout
+        self.subscriptions: Dict[str, None] = {}  # ordered set of event types
+        self.active = None
+        self.standbys: list = []
+        self.lost_at: Optional[float] = None
+        self.random = random.Random()
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before reconnect attempt number `attempt`"""
+        return self.random.uniform(0, min(self.max_backoff, self.initial_backoff * 2 ** attempt))
+
+    async def subscribe(self, event_type: str):
+        """Subscribe to an event type now if connected, and after every reconnect"""
+        if event_type in self.subscriptions:
+            return
+        self.subscriptions[event_type] = None
+        if self.active is not None:
+            try:
+                await self._send_subscriptions(self.active, [event_type])
+            except websockets.exceptions.ConnectionClosed:
+                pass  # replayed on the next connection
+
+    async def _send_subscriptions(self, ws, event_types: List[str]):
+        for event_type in event_types:
+            await ws.send(json.dumps({
+                "type": "SUBSCRIBE",
+                "event": event_type
+            }))
+
+    async def _activate(self, ws, path: str) -> bool:
+        """Make a connection the subscribed one; False if it is already closed"""
+        self.active = ws
+        try:
+            await self._send_subscriptions(ws, list(self.subscriptions))
+        except websockets.exceptions.ConnectionClosed:
+            if self.active is ws:
+                self.active = None
+            return False
+        if self.lost_at is not None:
+            gap = time.monotonic() - self.lost_at
+            self.lost_at = None
+            WS_RECONNECT_GAP.labels(path=path).observe(gap)
+            logger.info(f"WebSocket resubscribed via {path} after {gap * 1000:.1f}ms")
+        return True
+
+    async def _attach(self, ws):
+        if self.active is None and await self._activate(ws, 'reconnect'):
+            return
+        self.standbys.append(ws)
+
+    async def _detach(self, ws):
+        if ws in self.standbys:
+            self.standbys.remove(ws)
+        if ws is not self.active:
+            return
+        self.active = None
+        self.lost_at = time.monotonic()
+        logger.warning("Active WebSocket connection lost")
+        while self.standbys and self.active is None:
+            await self._activate(self.standbys.pop(0), 'standby')
+
+    async def _connection_slot(self, slot: int):
+        """Hold one connection open, reconnecting whenever it closes"""
+        attempt = 0
+        while True:
+            url = self.urls[(slot + attempt) % len(self.urls)]
+            try:
+                ws = await websockets.connect(
+                    url, ping_interval=self.ping_interval, open_timeout=self.open_timeout
+                )
+            except (OSError, asyncio.TimeoutError, websockets.exceptions.WebSocketException) as e:
+                logger.warning(f"WebSocket connect to slot {slot} failed: {e}")
+                await asyncio.sleep(self.backoff(attempt))
+                attempt += 1
+                continue
+
+            connected_at = time.monotonic()
+            try:
+                await self._attach(ws)
+                # Handlers run on dispatcher workers, never on the reader
+                async for message in ws:
+                    if ws is self.active:
+                        try:
+                            self.dispatcher.dispatch(message)
+                        except ValueError as e:
+                            logger.warning(f"Dropping undecodable WebSocket message: {e}")
+            except websockets.exceptions.ConnectionClosed:
+                pass
+            except asyncio.CancelledError:
+                await ws.close()
+                raise
+            except Exception as e:
+                # Never let one bad connection end the slot; reconnect instead
+                logger.exception(f"WebSocket slot {slot} failed: {e}")
+            await self._detach(ws)
+            await ws.close()
+
+            if time.monotonic() - connected_at >= self.stable_after:
+                attempt = 0
+            await asyncio.sleep(self.backoff(attempt))
+            attempt += 1
+
+    async def run(self):
+        """Keep the active and standby connections open until cancelled"""
+        await asyncio.gather(*(
+            self._connection_slot(slot) for slot in range(1 + self.standby)
+        ))